@@ -20,6 +20,7 @@ from models.schemas import OrderSignal, OrderStatus, SignalType, TradeLog
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
+CANCEL_BATCH_SIZE = 10  # Binance DELETE /fapi/v1/batchOrders accepts at most 10 ids
 
 
 class ExecutionAgent:
@@ -144,19 +145,40 @@ class ExecutionAgent:
             open_orders = self.exchange.fetch_open_orders(pair)
             if not open_orders:
                 return 0
+            order_ids = [order["id"] for order in open_orders]
             cancelled = 0
-            for order in open_orders:
-                try:
-                    self.exchange.cancel_order(order["id"], pair)
-                    cancelled += 1
-                except Exception as e:
-                    logger.warning(f"Failed to cancel order {order['id']}: {e}")
+            for start in range(0, len(order_ids), CANCEL_BATCH_SIZE):
+                cancelled += self._cancel_batch(order_ids[start:start + CANCEL_BATCH_SIZE], pair)
             logger.info(f"Cancelled {cancelled}/{len(open_orders)} old orders for {pair}")
             return cancelled
         except Exception as e:
             logger.warning(f"Failed to fetch open orders for {pair}: {e}")
             return 0
 
+    def _cancel_batch(self, order_ids: List[str], pair: str) -> int:
+        """Cancel up to CANCEL_BATCH_SIZE orders in one request. Returns count cancelled.
+
+        Uses batchOrders rather than allOpenOrders on purpose: the batch only touches
+        the ids we fetched, so anything placed outside fetch_open_orders is never hit.
+        Falls back to one cancel_order per id if the batch call itself fails.
+        """
+        if self.exchange.has.get("cancelOrders"):
+            try:
+                results = self.exchange.cancel_orders(order_ids, pair)
+                # Per-order rejections (e.g. already filled) come back as entries without an id
+                return sum(1 for result in results if result.get("id"))
+            except Exception as e:
+                logger.warning(f"Batch cancel failed for {pair}, cancelling one by one: {e}")
+
+        cancelled = 0
+        for order_id in order_ids:
+            try:
+                self.exchange.cancel_order(order_id, pair)
+                cancelled += 1
+            except Exception as e:
+                logger.warning(f"Failed to cancel order {order_id}: {e}")
+        return cancelled
+
     def selective_refresh(self, pair: str, new_signals: List[OrderSignal],
                           spacing_pct: float) -> Tuple[int, int, List[TradeLog]]:
         """Selectively cancel/replace grid orders. Only cancel orders outside the new grid.
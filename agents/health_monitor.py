@@ -9,18 +9,21 @@ Checks every hour:
 - Sends Telegram status report
 """
 
+from __future__ import annotations
+
 import logging
 import os
 import subprocess
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import ccxt
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from config import settings
 from database.db import get_connection
 
+if TYPE_CHECKING:  # annotation only — the monitor never calls ccxt itself
+    import ccxt
+
 logger = logging.getLogger(__name__)
 
 
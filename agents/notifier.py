@@ -4,18 +4,79 @@ Uses raw HTTP requests (no extra dependency) to send messages.
 Uses HTML parse mode (more forgiving than Markdown with special characters).
 """
 
+import http.client
 import logging
-import urllib.request
+import threading
 import urllib.parse
 import json
+from typing import List, Optional
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
-
-def send_telegram(message: str) -> bool:
-    """Send a message via Telegram bot API. Returns True on success."""
+TELEGRAM_HOST = "api.telegram.org"
+TELEGRAM_MAX_CHARS = 4096  # sendMessage text limit
+
+# One keep-alive HTTPS connection for all sends — a cycle report plus alerts no longer
+# pay a fresh TCP+TLS handshake each. Per process: scheduler.py and health_check_scheduler.py
+# each get their own. The lock only serializes threads within one process.
+_conn: Optional[http.client.HTTPSConnection] = None
+_conn_lock = threading.Lock()
+
+# Active TelegramBatch for the current thread, if any
+_batch_local = threading.local()
+
+
+def _post_telegram(path: str, body: bytes) -> dict:
+    """POST a form body to the Telegram API over the shared connection and return the JSON reply.
+
+    If sending the request on a reused keep-alive connection fails (the server dropped it
+    while idle), reconnect and send once more. A failure while reading the response is not
+    retried: Telegram may already have the message, and a resend would post it twice.
+    """
+    global _conn
+    with _conn_lock:
+        for attempt in range(2):
+            reused = _conn is not None
+            if _conn is None:
+                _conn = http.client.HTTPSConnection(TELEGRAM_HOST, timeout=10)
+            try:
+                _conn.request("POST", path, body=body,
+                              headers={"Content-Type": "application/x-www-form-urlencoded"})
+            except (BrokenPipeError, ConnectionResetError):
+                _conn.close()
+                _conn = None
+                if not reused or attempt:
+                    raise
+                continue
+            except Exception:
+                _conn.close()
+                _conn = None
+                raise
+            try:
+                return json.loads(_conn.getresponse().read())
+            except Exception:
+                _conn.close()
+                _conn = None
+                raise
+
+
+def send_telegram(message: str, urgent: bool = False) -> bool:
+    """Send a message via Telegram bot API. Returns True on success.
+
+    Inside a TelegramBatch the message is queued for the batch's single send instead
+    (and True is returned); urgent=True always sends immediately.
+    """
+    batch = getattr(_batch_local, "batch", None)
+    if batch is not None and not urgent:
+        batch.add(message)
+        return True
+    return _send_now(message)
+
+
+def _send_now(message: str) -> bool:
+    """POST one sendMessage request. Returns True on success."""
     token = settings.TELEGRAM_BOT_TOKEN
     chat_id = settings.TELEGRAM_CHAT_ID
 
@@ -23,7 +84,6 @@ def send_telegram(message: str) -> bool:
         logger.warning("Telegram not configured — skipping notification")
         return False
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
     data = urllib.parse.urlencode({
         "chat_id": chat_id,
         "text": message,
@@ -31,20 +91,75 @@ def send_telegram(message: str) -> bool:
     }).encode("utf-8")
 
     try:
-        req = urllib.request.Request(url, data=data)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            if result.get("ok"):
-                logger.info("Telegram message sent")
-                return True
-            else:
-                logger.error(f"Telegram API error: {result}")
-                return False
+        result = _post_telegram(f"/bot{token}/sendMessage", data)
+        if result.get("ok"):
+            logger.info("Telegram message sent")
+            return True
+        else:
+            logger.error(f"Telegram API error: {result}")
+            return False
     except Exception as e:
         logger.error(f"Failed to send Telegram message: {e}")
         return False
 
 
+class TelegramBatch:
+    """Collect send_telegram() calls made on this thread and send them as one message.
+
+    Used around a trading cycle so its warnings, stop notices and the cycle report go
+    out in one POST (split only if they exceed TELEGRAM_MAX_CHARS). Messages are
+    flushed on exit even if the block raises. A nested batch joins the outer one.
+    """
+
+    def __init__(self):
+        self.messages: List[str] = []
+        self._outer = None
+
+    def __enter__(self) -> "TelegramBatch":
+        self._outer = getattr(_batch_local, "batch", None)
+        if self._outer is None:
+            _batch_local.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._outer is None:
+            _batch_local.batch = None
+            self.flush()
+        return False
+
+    def add(self, message: str) -> None:
+        (self._outer or self).messages.append(message)
+
+    def flush(self) -> bool:
+        """Send everything queued so far. Returns True if every message was delivered."""
+        messages, self.messages = self.messages, []
+        ok = True
+        for group in _pack_messages(messages):
+            if _send_now("\n\n".join(group)):
+                continue
+            # One malformed message (e.g. unescaped HTML) fails the whole POST —
+            # retry individually so the rest still get through
+            if len(group) > 1:
+                ok = all([_send_now(m) for m in group]) and ok
+            else:
+                ok = False
+        return ok
+
+
+def _pack_messages(messages: List[str]) -> List[List[str]]:
+    """Group messages so each joined group stays within TELEGRAM_MAX_CHARS."""
+    groups: List[List[str]] = []
+    size = 0
+    for message in messages:
+        if groups and size + 2 + len(message) <= TELEGRAM_MAX_CHARS:
+            groups[-1].append(message)
+            size += 2 + len(message)
+        else:
+            groups.append([message])
+            size = len(message)
+    return groups
+
+
 def format_cycle_report(results: dict, balance: dict = None) -> str:
     """Format a trading cycle result into a Telegram message."""
     lines = ["<b>Trading Cycle Report</b>\n"]
@@ -122,7 +237,8 @@ def notify_kill_switch(cancelled: int) -> None:
     send_telegram(
         "🚨 <b>KILL SWITCH ACTIVATED</b>\n\n"
         f"All trading stopped. {cancelled} orders cancelled.\n"
-        "Use the /kill endpoint with action=reset to resume."
+        "Use the /kill endpoint with action=reset to resume.",
+        urgent=True,
     )
 
 
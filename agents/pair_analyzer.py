@@ -4,17 +4,27 @@ import json
 import logging
 import os
 import time
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
 import ccxt
 
 logger = logging.getLogger(__name__)
 
 # Active pairs file path (runtime state)
+# Parallel candidate scans — a full scan is ~36 request weight (12 × klines 2 + ticker 1),
+# far inside Binance's 2400/min; ccxt's enableRateLimit throttle still spaces the requests
+CANDIDATE_WORKERS = 8
+
 ACTIVE_PAIRS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "active_pairs.json")
 
+# (path, mtime_ns, size) → parsed pairs; re-read only when the file actually changes
+_active_pairs_cache: Optional[Tuple[Tuple[str, int, int], List[str]]] = None
+
 
 def save_active_pairs(pairs: List[str]) -> None:
     """Save active pairs to JSON file for persistence across bot restarts."""
+    global _active_pairs_cache
+    _active_pairs_cache = None
     try:
         with open(ACTIVE_PAIRS_FILE, 'w') as f:
             json.dump({"pairs": pairs, "updated_at": time.time()}, f, indent=2)
@@ -23,22 +33,31 @@ def save_active_pairs(pairs: List[str]) -> None:
         logger.error(f"Failed to save active pairs: {e}")
 
 
-def load_active_pairs(default_pairs: List[str]) -> List[str]:
-    """Load active pairs from JSON file, or return default if file doesn't exist."""
+def load_active_pairs(default_pairs: Sequence[str]) -> List[str]:
+    """Load active pairs from JSON file, or return default if file doesn't exist.
+
+    Called every cycle; the file is only re-parsed when its mtime/size changes.
+    """
+    global _active_pairs_cache
     try:
         if os.path.exists(ACTIVE_PAIRS_FILE):
+            st = os.stat(ACTIVE_PAIRS_FILE)
+            key = (ACTIVE_PAIRS_FILE, st.st_mtime_ns, st.st_size)
+            if _active_pairs_cache is not None and _active_pairs_cache[0] == key:
+                return list(_active_pairs_cache[1])
             with open(ACTIVE_PAIRS_FILE, 'r') as f:
                 data = json.load(f)
-                pairs = data.get("pairs", default_pairs)
+                pairs = data.get("pairs", list(default_pairs))
                 logger.info(f"Loaded active pairs from file: {pairs}")
+                _active_pairs_cache = (key, list(pairs))
                 return pairs
         else:
             logger.info(f"No active pairs file found, using default: {default_pairs}")
-            save_active_pairs(default_pairs)  # Create file with defaults
-            return default_pairs
+            save_active_pairs(list(default_pairs))  # Create file with defaults
+            return list(default_pairs)
     except Exception as e:
         logger.error(f"Failed to load active pairs, using default: {e}")
-        return default_pairs
+        return list(default_pairs)
 
 
 class PairAnalyzer:
@@ -75,55 +94,58 @@ class PairAnalyzer:
             'DOT/USDT:USDT',
         ]
 
-        results = []
-        for symbol in candidates:
-            try:
-                # Fetch 48h of hourly data
-                ohlcv = self.exchange.fetch_ohlcv(symbol, '15m', limit=192)  # 15m × 192 = 48 hours
-                prices = [x[4] for x in ohlcv]  # Close prices
-
-                # Calculate volatility (48h range as % of price)
-                high_48h = max(prices)
-                low_48h = min(prices)
-                current = prices[-1]
-                volatility_pct = ((high_48h - low_48h) / current) * 100
-
-                # Get 24h volume
-                ticker = self.exchange.fetch_ticker(symbol)
-                volume_24h = ticker.get('quoteVolume', 0)
-
-                # Calculate grid trading score
-                # Volatility weight: 60% (more volatility = more grid opportunities)
-                # Volume weight: 40% (higher volume = better fills)
-                volatility_score = min(volatility_pct / 10, 10)  # Cap at 10%
-                volume_score = min(volume_24h / 100_000_000, 10)  # $100M = max score
-
-                score = (volatility_score * 0.6) + (volume_score * 0.4)
-
-                results.append({
-                    'symbol': symbol,
-                    'price': current,
-                    'volatility': volatility_pct,
-                    'volume': volume_24h,
-                    'score': score,
-                })
-
-                logger.info(
-                    f"{symbol}: vol={volatility_pct:.2f}%, "
-                    f"vol24h=${volume_24h/1e6:.1f}M, score={score:.2f}"
-                )
-
-                time.sleep(0.2)  # Rate limit
-
-            except Exception as e:
-                logger.warning(f"Failed to analyze {symbol}: {e}")
-                continue
+        # Each candidate is two independent REST calls — overlap them. Results keep
+        # candidate order, so ties sort exactly as the serial scan did.
+        with ThreadPoolExecutor(max_workers=CANDIDATE_WORKERS) as pool:
+            results = [r for r in pool.map(self._score_candidate, candidates) if r is not None]
 
         # Sort by score (highest first)
         results.sort(key=lambda x: x['score'], reverse=True)
 
         return results[:top_n]
 
+    def _score_candidate(self, symbol: str) -> Optional[Dict]:
+        """Fetch 48h of candles + 24h volume for one candidate and score it (None on failure)."""
+        try:
+            # Fetch 48h of hourly data
+            ohlcv = self.exchange.fetch_ohlcv(symbol, '15m', limit=192)  # 15m × 192 = 48 hours
+            prices = [x[4] for x in ohlcv]  # Close prices
+
+            # Calculate volatility (48h range as % of price)
+            high_48h = max(prices)
+            low_48h = min(prices)
+            current = prices[-1]
+            volatility_pct = ((high_48h - low_48h) / current) * 100
+
+            # Get 24h volume
+            ticker = self.exchange.fetch_ticker(symbol)
+            volume_24h = ticker.get('quoteVolume', 0)
+
+            # Calculate grid trading score
+            # Volatility weight: 60% (more volatility = more grid opportunities)
+            # Volume weight: 40% (higher volume = better fills)
+            volatility_score = min(volatility_pct / 10, 10)  # Cap at 10%
+            volume_score = min(volume_24h / 100_000_000, 10)  # $100M = max score
+
+            score = (volatility_score * 0.6) + (volume_score * 0.4)
+
+            logger.info(
+                f"{symbol}: vol={volatility_pct:.2f}%, "
+                f"vol24h=${volume_24h/1e6:.1f}M, score={score:.2f}"
+            )
+
+            return {
+                'symbol': symbol,
+                'price': current,
+                'volatility': volatility_pct,
+                'volume': volume_24h,
+                'score': score,
+            }
+
+        except Exception as e:
+            logger.warning(f"Failed to analyze {symbol}: {e}")
+            return None
+
     def recommend_grid_spacing(self, volatility_pct: float) -> float:
         """
         Recommend grid spacing based on volatility.
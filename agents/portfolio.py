@@ -28,18 +28,35 @@ class PortfolioTracker:
             return
 
         conn = get_connection()
-        cursor = conn.cursor()
+        self._upsert_trades(conn, trades)
+        conn.commit()
+        conn.close()
+        logger.info(f"Recorded {len(trades)} trades to database")
 
-        for trade in trades:
-            cursor.execute("""
-                INSERT INTO trades (order_id, pair, side, price, amount, filled, fee, status, signal_type, timestamp, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(order_id) DO UPDATE SET
-                    filled = excluded.filled,
-                    fee = excluded.fee,
-                    status = excluded.status,
-                    updated_at = excluded.updated_at
-            """, (
+    def replace_open_orders(self, pair: str, trades: List[TradeLog]) -> None:
+        """Mark a pair's PENDING/OPEN rows CANCELLED, then record its new trades.
+
+        One transaction and one commit per grid refresh. The UPDATE must land before
+        the next pair is risk-checked, since RiskManager counts open rows in this table.
+        """
+        conn = get_connection()
+        conn.execute(
+            "UPDATE trades SET status = 'CANCELLED' WHERE status IN ('PENDING', 'OPEN') AND pair = ?",
+            (pair,),
+        )
+        if trades:
+            self._upsert_trades(conn, trades)
+        conn.commit()
+        conn.close()
+        if trades:
+            logger.info(f"Recorded {len(trades)} trades to database")
+
+    @staticmethod
+    def _upsert_trades(conn, trades: List[TradeLog]) -> None:
+        """Insert trades on conn, updating fill/status of existing order_ids. Caller commits."""
+        updated_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
                 trade.order_id,
                 trade.pair,
                 trade.side.value,
@@ -50,12 +67,19 @@ class PortfolioTracker:
                 trade.status.value,
                 trade.signal_type.value,
                 trade.timestamp.isoformat(),
-                datetime.now(timezone.utc).isoformat(),
-            ))
-
-        conn.commit()
-        conn.close()
-        logger.info(f"Recorded {len(trades)} trades to database")
+                updated_at,
+            )
+            for trade in trades
+        ]
+        conn.executemany("""
+            INSERT INTO trades (order_id, pair, side, price, amount, filled, fee, status, signal_type, timestamp, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(order_id) DO UPDATE SET
+                filled = excluded.filled,
+                fee = excluded.fee,
+                status = excluded.status,
+                updated_at = excluded.updated_at
+        """, rows)
 
     def get_snapshot(self, current_balance: float = 0.0) -> PortfolioSnapshot:
         """Get current portfolio snapshot with P&L calculations."""
@@ -13,229 +13,457 @@ DCA Mode (CRASH):
 """
 
 import logging
+import math
+import sqlite3
+import time
 from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
 from typing import List, Optional, Tuple
 
 import ccxt
+import numpy as np
 
 from config import settings
 from config.grid_config import GRID_PARAMS, DCA_PARAMS
 from database.db import get_connection
-from models.schemas import MarketRegime, MarketState, OrderSide, OrderSignal, SignalType
+from models.schemas import MarketRegime, MarketState, OrderSide, OrderSignal, PositionSide, SignalType
 
 logger = logging.getLogger(__name__)
 
+# Position snapshots are reused within one signal-generation pass, never across scheduler cycles
+POSITION_CACHE_TTL_SEC = 2.0
+# Batch-prefetched positions cover one scheduler pass over all pairs; older → live fetch
+PREFETCH_MAX_AGE_SEC = 30.0
+# Funding settles every 8h — a rate up to 5 min old is still current enough for the safety check
+FUNDING_CACHE_TTL_SEC = 300.0
+
+# pair → (monotonic expiry, funding rate). Module level, not per agent: the scheduler builds a
+# new StrategyAgent every 60s cycle, so a per-instance cache would never outlive its TTL.
+_funding_cache: dict = {}
+
+# Grid split per effective position bias (clamped to ±2): num_grids → (num_buys, num_sells)
+_BIAS_SPLITS = {
+    # CLOSE-ONLY: heavy short — place ONLY buys, zero sells that would add exposure
+    -2: lambda n: (n, 0),
+    # Slight short bias — more buys, fewer sells to reduce
+    -1: lambda n: (n - max(1, n // 2 - 1), max(1, n // 2 - 1)),
+    0: lambda n: (n // 2, n // 2),
+    # Slight long bias — fewer buys, more sells to reduce
+    1: lambda n: (max(1, n // 2 - 1), n - max(1, n // 2 - 1)),
+    # CLOSE-ONLY: heavy long — place ONLY sells, zero buys that would add exposure
+    2: lambda n: (0, n),
+}
+
+
+def _dca_add_entry(total_qty: float, total_cost: float, amount: float, cost: float) -> Tuple[float, float, float]:
+    """Return (total_qty, total_cost, avg_entry_price) after adding one DCA entry."""
+    new_total_qty = total_qty + amount
+    new_total_cost = total_cost + cost
+    return new_total_qty, new_total_cost, new_total_cost / new_total_qty
+
+
+# value/tick within this of a rounding boundary is decided by ccxt's decimal arithmetic instead —
+# float division can't tell 0.3 / 0.1 (= 2.9999999999999996) from a value just under 3 ticks
+_TICK_EPS = 1e-6
+
+
+def _tick_decimals(tick: float) -> int:
+    """Number of decimal places in a tick size (0.01 → 2, 1e-05 → 5, 1 → 0)."""
+    return max(0, -Decimal(str(tick)).normalize().as_tuple().exponent)
+
+
+def grid_spacing(market_state: MarketState, num_grids: int) -> Tuple[float, float, float, float]:
+    """Hybrid BB+ADX+confidence grid spacing for a market state.
+
+    Returns:
+        (spacing_pct, bb_width_pct, adx_multiplier, confidence_mult)
+    """
+    # HYBRID BB+ADX SPACING: BB measures actual range, ADX adds safety buffer for forming trends
+    # BB base: spacing = BB_width / num_grids (measures what the market IS doing)
+    # ADX multiplier: widens spacing as trend strengthens (prepares for what's COMING)
+    # ADX ≤ 15: ×1.0 (dead market, pure BB), ADX 25: ×1.2, ADX 40+: ×1.5 (cap)
+    # Confidence multiplier: widens spacing when regime classification is uncertain
+    price = market_state.current_price
+    indicators = market_state.indicators
+    bb_width_pct = (indicators.bb_upper - indicators.bb_lower) / price if price > 0 else 0.01
+    adx = indicators.adx
+    adx_multiplier = min(1.5, max(1.0, 1.0 + (adx - 15) * 0.02)) if adx > 15 else 1.0
+
+    # Low confidence = ambiguous regime → widen spacing for safety
+    # Confidence < 0.5 means ≤1 of 4 indicators agree — be cautious
+    confidence_mult = 1.3 if market_state.regime_confidence < 0.5 else 1.0
+
+    spacing_pct = max(0.004, min(0.02, (bb_width_pct / num_grids) * adx_multiplier * confidence_mult))
+    return spacing_pct, bb_width_pct, adx_multiplier, confidence_mult
+
+
+def _order_signal(
+    *, pair: str, side: OrderSide, price: float, amount: float,
+    signal_type: SignalType, timestamp: datetime,
+) -> OrderSignal:
+    """Build an OrderSignal from values this agent computed itself.
+
+    Skips pydantic validation (model_construct) — every caller passes a str pair, enum
+    members, Python floats from the rounding helpers and an aware datetime.
+    """
+    return OrderSignal.model_construct(
+        pair=pair, side=side, price=price, amount=amount, signal_type=signal_type, timestamp=timestamp,
+    )
+
+
+def _parse_position(pos: dict) -> Optional[dict]:
+    """Return position info for a ccxt position entry, or None if it holds no contracts."""
+    amt = float(pos.get("contracts", 0) or 0)
+    if amt <= 0:
+        return None
+    entry_price = float(pos.get("entryPrice", 0) or 0)
+    return {
+        "side": PositionSide.from_ccxt(pos.get("side")),
+        "amount": amt,
+        "entryPrice": entry_price,
+        "notional": amt * entry_price,
+    }
+
+
+# dca_state statements — kept as constants so sqlite3's statement cache reuses the compiled SQL
+_SQL_ACTIVE_DCA = (
+    "SELECT id, pair, entries, total_qty, total_cost, avg_entry_price, last_entry_price "
+    "FROM dca_state WHERE active = 1 ORDER BY id"
+)
+_SQL_INSERT_DCA = (
+    "INSERT INTO dca_state (pair, entries, total_qty, total_cost, avg_entry_price, last_entry_price, "
+    "active, started_at, updated_at) VALUES (?, 1, ?, ?, ?, ?, 1, ?, ?)"
+)
+_SQL_UPDATE_DCA = (
+    "UPDATE dca_state SET entries = ?, total_qty = ?, total_cost = ?, avg_entry_price = ?, "
+    "last_entry_price = ?, updated_at = ? WHERE id = ?"
+)
+_SQL_CLOSE_DCA = "UPDATE dca_state SET active = 0, updated_at = ? WHERE id = ?"
+
 
 class StrategyAgent:
     """Determines which strategy to run based on market regime and generates order signals."""
 
     def __init__(self, exchange: ccxt.Exchange):
         self.exchange = exchange
+        # pair → (monotonic expiry, position info) — see prefetch_cycle_state
+        self._position_cache: dict = {}
+        self._conn: Optional[sqlite3.Connection] = None  # see _db
+        self._tick_cache: dict = {}  # pair → ticks or None, see _ticks
+        self._pending_dca_writes: List[Tuple[str, tuple]] = []  # (sql, params), see _flush_dca_writes
+        self._active_dca: Optional[dict] = None  # pair → active DCA row, see _get_active_dca
 
     def generate_signals(self, market_state: MarketState) -> List[OrderSignal]:
         """Generate order signals based on current market state and regime."""
+        # One timestamp for every signal and DCA state write of this pass
+        now = datetime.now(timezone.utc)
+        try:
+            return self._signals_for_regime(market_state, now)
+        finally:
+            # DCA state changes from this pass are committed together (one transaction, one fsync)
+            self._flush_dca_writes()
+
+    def _signals_for_regime(self, market_state: MarketState, now: datetime) -> List[OrderSignal]:
+        """Dispatch to DCA, grid or close-only signals for the market regime."""
         pair = market_state.pair
         regime = market_state.regime
 
         if pair not in GRID_PARAMS:
-            logger.warning(f"No grid config for {pair}, skipping")
+            logger.warning("No grid config for %s, skipping", pair)
             return []
 
         if regime == MarketRegime.CRASH:
-            return self._dca_signals(market_state)
+            return self._dca_signals(market_state, now)
+
+        # One position snapshot for the DCA exit, funding/bias and close-only decisions below
+        position_info = self._get_position_info(pair)
 
         # If not crashing, close any active DCA by placing take-profit if we have a position
-        dca_tp = self._dca_take_profit_if_recovered(market_state)
+        dca_tp = self._dca_take_profit_if_recovered(market_state, position_info, now)
 
         # REGIME-AWARE TRADING PAUSE: Only trade grid in RANGING markets
         # In TRENDING markets, grid orders don't fill (0% fill rate) and waste API calls
         # Better to pause and wait for ranging conditions to return
         if regime == MarketRegime.RANGING:
-            return dca_tp + self._grid_signals(market_state, bias=0, regime=regime)
+            return dca_tp + self._grid_signals(market_state, position_info, bias=0, regime=regime, now=now)
         elif regime in [MarketRegime.TRENDING_UP, MarketRegime.TRENDING_DOWN]:
             adx = market_state.indicators.adx
             # CLOSE-ONLY: If we have an open position, place closing orders even during TRENDING
             # This prevents profitable positions from getting stranded with no exit orders
-            close_signals = self._close_only_signals(market_state)
+            close_signals = self._close_only_signals(market_state, position_info, now)
             if close_signals:
                 logger.info(
-                    f"{pair} TRENDING ({regime.value}, ADX={adx:.1f}) — "
-                    f"grid paused, placing {len(close_signals)} close-only order(s)"
+                    "%s TRENDING (%s, ADX=%.1f) — grid paused, placing %d close-only order(s)",
+                    pair, regime.value, adx, len(close_signals),
                 )
                 return dca_tp + close_signals
             logger.info(
-                f"{pair} GRID PAUSED: {regime.value} market (ADX={adx:.1f}) — "
-                f"no position, waiting for RANGING conditions"
+                "%s GRID PAUSED: %s market (ADX=%.1f) — no position, waiting for RANGING conditions",
+                pair, regime.value, adx,
             )
             return dca_tp
 
         return dca_tp
 
-    def _grid_signals(self, market_state: MarketState, bias: int = 0, regime: MarketRegime = MarketRegime.RANGING) -> List[OrderSignal]:
+    def _grid_signals(
+        self, market_state: MarketState, position_info: Optional[dict], bias: int = 0,
+        regime: MarketRegime = MarketRegime.RANGING, now: Optional[datetime] = None,
+    ) -> List[OrderSignal]:
         """Generate position-aware grid buy/sell signals.
 
-        Checks current exchange position and biases the grid to close
-        accumulated exposure, preventing one-sided position buildup.
+        Biases the grid against the current exchange position (position_info,
+        fetched once per pass) to close accumulated exposure, preventing
+        one-sided position buildup.
 
         Only runs in RANGING markets (6 levels). TRENDING markets are
         handled by regime pause in generate_signals().
         """
         pair = market_state.pair
-        price = market_state.current_price
-        params = GRID_PARAMS[pair]
 
         # FUNDING RATE SAFETY CHECK: Skip grid if funding is heavily against position direction
         # Determine position direction based on current exposure
-        position_info = self._get_position_info(pair)
         if position_info and position_info["amount"] > 0:
             # We have an open position — check funding for that direction
-            position_side = position_info["side"].upper()
-            is_safe, funding_rate = self._check_funding_rate_safety(pair, position_side)
+            is_safe, funding_rate = self._check_funding_rate_safety(pair, position_info["side"])
             if not is_safe:
-                logger.warning(f"{pair} grid skipped due to extreme funding rate: {funding_rate*100:.4f}%")
+                logger.warning("%s grid skipped due to extreme funding rate: %.4f%%", pair, funding_rate * 100)
                 return []  # Skip grid orders entirely if funding is too bad
         else:
             # No position yet — check funding for LONG (since grid typically accumulates longs in downtrends)
             # If funding is extremely negative, we might accumulate a long and bleed money
-            is_safe, funding_rate = self._check_funding_rate_safety(pair, "LONG")
+            is_safe, funding_rate = self._check_funding_rate_safety(pair, PositionSide.LONG)
             if not is_safe:
-                logger.warning(f"{pair} grid skipped due to extreme negative funding (would hurt potential longs)")
+                logger.warning("%s grid skipped due to extreme negative funding (would hurt potential longs)", pair)
                 return []
 
-        num_grids = params["num_grids"]  # 6 levels (3 buy + 3 sell)
-
-        order_size_usdt = params["order_size_usdt"]
-
-        # HYBRID BB+ADX SPACING: BB measures actual range, ADX adds safety buffer for forming trends
-        # BB base: spacing = BB_width / num_grids (measures what the market IS doing)
-        # ADX multiplier: widens spacing as trend strengthens (prepares for what's COMING)
-        # ADX ≤ 15: ×1.0 (dead market, pure BB), ADX 25: ×1.2, ADX 40+: ×1.5 (cap)
-        # Confidence multiplier: widens spacing when regime classification is uncertain
-        bb_upper = market_state.indicators.bb_upper
-        bb_lower = market_state.indicators.bb_lower
-        bb_width_pct = (bb_upper - bb_lower) / price if price > 0 else 0.01
-        adx = market_state.indicators.adx
-        adx_multiplier = min(1.5, max(1.0, 1.0 + (adx - 15) * 0.02)) if adx > 15 else 1.0
+        # Bias the grid against the current exchange position
+        position_bias = self._get_position_bias(pair, position_info)
 
-        # Low confidence = ambiguous regime → widen spacing for safety
-        # Confidence < 0.5 means ≤1 of 4 indicators agree — be cautious
-        confidence = market_state.regime_confidence
-        confidence_mult = 1.3 if confidence < 0.5 else 1.0
+        # Everything below works from market_state + the values fetched above — no exchange I/O
+        return self._grid_from_state(market_state, bias, position_bias, regime, now or datetime.now(timezone.utc))
 
-        spacing_pct = max(0.004, min(0.02, (bb_width_pct / num_grids) * adx_multiplier * confidence_mult))
+    def _grid_from_state(
+        self, market_state: MarketState, bias: int, position_bias: int,
+        regime: MarketRegime, now: datetime,
+    ) -> List[OrderSignal]:
+        """Compute grid spacing, buy/sell split and level signals for an already-checked pair."""
+        pair = market_state.pair
+        price = market_state.current_price
+        params = GRID_PARAMS[pair]
+        num_grids = params.num_grids  # 6 levels (3 buy + 3 sell)
+        order_size_usdt = params.order_size_usdt
 
-        # Check current position on exchange to determine bias
-        position_bias = self._get_position_bias(pair)
+        spacing_pct, bb_width_pct, adx_multiplier, confidence_mult = grid_spacing(market_state, num_grids)
         effective_bias = bias + position_bias
 
-        if effective_bias >= 2:
-            # CLOSE-ONLY: heavy long — place ONLY sells, zero buys that would add exposure
-            num_buys = 0
-            num_sells = num_grids
-            logger.warning(f"{pair} CLOSE-ONLY MODE: long position ≥2x grid — 0 buys, {num_sells} sells")
-        elif effective_bias <= -2:
-            # CLOSE-ONLY: heavy short — place ONLY buys, zero sells that would add exposure
-            num_buys = num_grids
-            num_sells = 0
-            logger.warning(f"{pair} CLOSE-ONLY MODE: short position ≥2x grid — {num_buys} buys, 0 sells")
-        elif effective_bias > 0:
-            # Slight long bias — fewer buys, more sells to reduce
-            num_buys = max(1, num_grids // 2 - 1)
-            num_sells = num_grids - num_buys
-        elif effective_bias < 0:
-            # Slight short bias — more buys, fewer sells to reduce
-            num_sells = max(1, num_grids // 2 - 1)
-            num_buys = num_grids - num_sells
-        else:
-            num_buys = num_grids // 2
-            num_sells = num_grids // 2
+        clamped_bias = max(-2, min(2, effective_bias))
+        num_buys, num_sells = _BIAS_SPLITS[clamped_bias](num_grids)
+        if clamped_bias == 2:
+            logger.warning("%s CLOSE-ONLY MODE: long position ≥2x grid — 0 buys, %d sells", pair, num_sells)
+        elif clamped_bias == -2:
+            logger.warning("%s CLOSE-ONLY MODE: short position ≥2x grid — %d buys, 0 sells", pair, num_buys)
 
-        signals = []
-        now = datetime.now(timezone.utc)
-        leverage = settings.LEVERAGE
-
-        for i in range(1, num_buys + 1):
-            level_price = self._round_price(pair, price * (1 - spacing_pct * i))
-            amount = self._round_amount(pair, max(order_size_usdt * leverage / level_price, 0.001))
-            if amount <= 0:
-                continue
-            signals.append(OrderSignal(
-                pair=pair, side=OrderSide.BUY, price=level_price,
-                amount=amount, signal_type=SignalType.GRID_BUY, timestamp=now,
-            ))
-
-        for i in range(1, num_sells + 1):
-            level_price = self._round_price(pair, price * (1 + spacing_pct * i))
-            amount = self._round_amount(pair, max(order_size_usdt * leverage / level_price, 0.001))
-            if amount <= 0:
-                continue
-            signals.append(OrderSignal(
-                pair=pair, side=OrderSide.SELL, price=level_price,
-                amount=amount, signal_type=SignalType.GRID_SELL, timestamp=now,
-            ))
-
-        # Log grid summary
-        buy_prices = [s.price for s in signals if s.side == OrderSide.BUY]
-        sell_prices = [s.price for s in signals if s.side == OrderSide.SELL]
-        buy_range = f"${min(buy_prices):.4f}-${max(buy_prices):.4f}" if buy_prices else "none"
-        sell_range = f"${min(sell_prices):.4f}-${max(sell_prices):.4f}" if sell_prices else "none"
-
-        # Log hybrid BB+ADX+confidence spacing
-        conf_note = " [LOW CONF→×1.3]" if confidence_mult > 1.0 else ""
-        logger.info(
-            f"{pair} SPACING: BB={bb_width_pct*100:.2f}% × ADX={adx_multiplier:.2f} × conf={confidence_mult:.1f} "
-            f"→ {spacing_pct*100:.2f}%{conf_note} "
-            f"(BB ${bb_lower:.2f}-${bb_upper:.2f}, ADX={adx:.1f}, regime_conf={confidence:.0%})"
-        )
+        notional = order_size_usdt * settings.LEVERAGE
 
-        logger.info(
-            f"{pair} grid: {num_buys} buy, {num_sells} sell, "
-            f"levels={num_grids} ({regime.value}), spacing={spacing_pct*100:.2f}%, "
-            f"size={order_size_usdt} USDT, pos_bias={position_bias}, effective_bias={effective_bias}"
-        )
-        logger.info(
-            f"{pair} grid placement: current=${price:.4f} | buys={buy_range} | sells={sell_range}"
+        signals, (buy_lo, buy_hi, sell_lo, sell_hi) = self._build_grid_levels(
+            pair, price, spacing_pct, num_buys, num_sells, notional, now,
         )
+
+        # Log grid summary — only formatted when INFO is actually emitted
+        if logger.isEnabledFor(logging.INFO):
+            buy_range = f"${buy_lo:.4f}-${buy_hi:.4f}" if buy_lo <= buy_hi else "none"
+            sell_range = f"${sell_lo:.4f}-${sell_hi:.4f}" if sell_lo <= sell_hi else "none"
+
+            # Log hybrid BB+ADX+confidence spacing
+            indicators = market_state.indicators
+            conf_note = " [LOW CONF→×1.3]" if confidence_mult > 1.0 else ""
+            logger.info(
+                "%s SPACING: BB=%.2f%% × ADX=%.2f × conf=%.1f → %.2f%%%s (BB $%.2f-$%.2f, ADX=%.1f, regime_conf=%.0f%%)",
+                pair, bb_width_pct * 100, adx_multiplier, confidence_mult, spacing_pct * 100, conf_note,
+                indicators.bb_lower, indicators.bb_upper, indicators.adx, market_state.regime_confidence * 100,
+            )
+            logger.info(
+                "%s grid: %d buy, %d sell, levels=%d (%s), spacing=%.2f%%, size=%s USDT, pos_bias=%d, effective_bias=%d",
+                pair, num_buys, num_sells, num_grids, regime.value, spacing_pct * 100,
+                order_size_usdt, position_bias, effective_bias,
+            )
+            logger.info("%s grid placement: current=$%.4f | buys=%s | sells=%s", pair, price, buy_range, sell_range)
         return signals
 
+    def _build_grid_levels(
+        self, pair: str, price: float, spacing_pct: float,
+        num_buys: int, num_sells: int, notional: float, now: datetime,
+    ) -> Tuple[List[OrderSignal], Tuple[float, float, float, float]]:
+        """Build grid level signals around price.
+
+        Returns:
+            (signals, (buy_lo, buy_hi, sell_lo, sell_hi)) — ranges are inf/-inf for an empty side
+        """
+        # Raw level prices and order amounts for every level in vectorized passes — only
+        # exchange precision rounding and OrderSignal construction remain per level
+        steps = spacing_pct * np.arange(1, max(num_buys, num_sells) + 1, dtype=np.float64)
+        buy_prices = self._round_prices(pair, price * (1 - steps[:num_buys]))
+        sell_prices = self._round_prices(pair, price * (1 + steps[:num_sells]))
+        buy_amounts = np.maximum(notional / np.asarray(buy_prices, dtype=np.float64), 0.001).tolist()
+        sell_amounts = np.maximum(notional / np.asarray(sell_prices, dtype=np.float64), 0.001).tolist()
+
+        # Levels step away from price monotonically (rounding keeps the order), so each side's
+        # range is just its first and last level
+        buy_lo, buy_hi = (buy_prices[-1], buy_prices[0]) if buy_prices else (float("inf"), float("-inf"))
+        sell_lo, sell_hi = (sell_prices[0], sell_prices[-1]) if sell_prices else (float("inf"), float("-inf"))
+
+        # Amounts rounded to exchange precision; a level whose amount rounds to zero is dropped
+        # (unreachable in practice — amounts are floored at 0.001 and the fallback never rounds to 0)
+        signals = [
+            _order_signal(
+                pair=pair, side=side, price=level_price,
+                amount=amount, signal_type=signal_type, timestamp=now,
+            )
+            for side, signal_type, prices, amounts in (
+                (OrderSide.BUY, SignalType.GRID_BUY, buy_prices, buy_amounts),
+                (OrderSide.SELL, SignalType.GRID_SELL, sell_prices, sell_amounts),
+            )
+            for level_price, amount in zip(prices, self._round_amounts(pair, amounts))
+            if amount > 0
+        ]
+        return signals, (buy_lo, buy_hi, sell_lo, sell_hi)
+
+    def _ticks(self, pair: str) -> Optional[Tuple[float, int, float, int]]:
+        """Return cached (price_tick, price_decimals, amount_tick, amount_decimals) for the pair.
+
+        None when the exchange doesn't use tick-size precision (or the market has no numeric
+        ticks) — callers then go through ccxt's *_to_precision.
+        """
+        if pair in self._tick_cache:
+            return self._tick_cache[pair]
+        try:
+            if self.exchange.precisionMode != ccxt.TICK_SIZE:
+                ticks = None
+            else:
+                precision = self.exchange.market(pair)["precision"]
+                price_tick, amount_tick = precision["price"], precision["amount"]
+                if isinstance(price_tick, (int, float)) and isinstance(amount_tick, (int, float)) \
+                        and price_tick > 0 and amount_tick > 0:
+                    ticks = (float(price_tick), _tick_decimals(price_tick), float(amount_tick), _tick_decimals(amount_tick))
+                else:
+                    ticks = None
+        except Exception:
+            return None  # Markets not loaded yet — don't cache, retry next call
+        self._tick_cache[pair] = ticks
+        return ticks
+
     def _round_price(self, pair: str, price: float) -> float:
-        """Round price to exchange's required precision for the pair."""
+        """Round price to exchange's required precision for the pair.
+
+        Uses cached tick sizes (half-up, as ccxt ROUND); zero results and values at a
+        rounding boundary go through ccxt so edge cases behave exactly as before.
+        """
+        ticks = self._ticks(pair)
+        if ticks is not None:
+            tick, decimals = ticks[0], ticks[1]
+            steps = price / tick + 0.5
+            whole = math.floor(steps)
+            if whole > 0 and _TICK_EPS < steps - whole < 1 - _TICK_EPS:
+                return round(whole * tick, decimals)
         try:
             return float(self.exchange.price_to_precision(pair, price))
         except Exception:
             return round(price, 6)
 
+    def _round_prices(self, pair: str, prices: np.ndarray) -> List[float]:
+        """Round an array of prices to the pair's exchange precision."""
+        return [self._round_price(pair, p) for p in prices.tolist()]
+
     def _round_amount(self, pair: str, amount: float) -> float:
-        """Round amount to exchange's required precision for the pair."""
+        """Round amount to exchange's required precision for the pair.
+
+        Uses cached tick sizes (truncated, as ccxt); zero results and values at a
+        tick boundary go through ccxt so edge cases behave exactly as before.
+        """
+        ticks = self._ticks(pair)
+        if ticks is not None:
+            tick, decimals = ticks[2], ticks[3]
+            steps = amount / tick
+            whole = math.floor(steps)
+            if whole > 0 and _TICK_EPS < steps - whole < 1 - _TICK_EPS:
+                return round(whole * tick, decimals)
         try:
             return float(self.exchange.amount_to_precision(pair, amount))
         except Exception:
             return round(amount, 3)
 
+    def _round_amounts(self, pair: str, amounts: List[float]) -> List[float]:
+        """Round a list of amounts to the pair's exchange precision."""
+        return [self._round_amount(pair, a) for a in amounts]
+
+    def prefetch_cycle_state(self, pairs: List[str], positions: Optional[list] = None) -> None:
+        """Load positions and funding rates for all pairs with one exchange call each.
+
+        Pass positions when the caller already fetched them this cycle (scheduler does for P&L).
+        Funding is only fetched for pairs whose cached rate has expired. On a failed fetch
+        nothing is stored, so per-pair lookups fall back to live calls.
+        """
+        now = time.monotonic()
+        expires_at = now + PREFETCH_MAX_AGE_SEC
+        # New cycle — pick up dca_state changes made outside this agent (e.g. main.py at startup)
+        self._active_dca = None
+        try:
+            if positions is None:
+                positions = self.exchange.fetch_positions(pairs)
+            by_pair = {pair: None for pair in pairs}
+            for pos in positions:
+                symbol = pos.get("symbol", "")
+                # First open entry per symbol wins — same as the per-pair scan
+                if symbol in by_pair and by_pair[symbol] is None:
+                    by_pair[symbol] = _parse_position(pos)
+            for pair, position_info in by_pair.items():
+                self._position_cache[pair] = (expires_at, position_info)
+        except Exception as e:
+            logger.warning("Failed to prefetch positions: %s", e)
+
+        stale = [pair for pair in pairs if pair not in _funding_cache or _funding_cache[pair][0] <= now]
+        if not stale:
+            return
+        try:
+            rates = self.exchange.fetch_funding_rates(stale)
+            for pair in stale:
+                if pair in rates:
+                    _funding_cache[pair] = (now + FUNDING_CACHE_TTL_SEC, float(rates[pair].get("fundingRate", 0)))
+        except Exception as e:
+            logger.warning("Failed to prefetch funding rates: %s", e)
+
     def _get_position_info(self, pair: str) -> Optional[dict]:
         """Get current position info from exchange.
 
+        Results are cached per pair for POSITION_CACHE_TTL_SEC so the funding check,
+        bias calc and close-only/DCA paths within one cycle share a single fetch
+        (or until PREFETCH_MAX_AGE_SEC after prefetch_cycle_state).
+
         Returns:
             dict with 'side', 'amount', 'notional', 'entryPrice' or None if no position
         """
+        cached = self._position_cache.get(pair)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
         try:
             positions = self.exchange.fetch_positions([pair])
+            position_info = None
             for pos in positions:
-                amt = float(pos.get("contracts", 0) or 0)
-                if amt > 0:
-                    return {
-                        "side": pos.get("side", ""),
-                        "amount": amt,
-                        "entryPrice": float(pos.get("entryPrice", 0) or 0),
-                        "notional": amt * float(pos.get("entryPrice", 0) or 0),
-                    }
-            return None
+                position_info = _parse_position(pos)
+                if position_info:
+                    break
         except Exception as e:
-            logger.warning(f"Failed to fetch position info: {e}")
+            # Not cached — the next caller retries rather than reusing a failed "no position" read
+            logger.warning("Failed to fetch position info: %s", e)
             return None
 
-    def _get_position_bias(self, pair: str) -> int:
-        """Check exchange position and return bias to counter it.
+        self._position_cache[pair] = (time.monotonic() + POSITION_CACHE_TTL_SEC, position_info)
+        return position_info
+
+    def _get_position_bias(self, pair: str, position_info: Optional[dict]) -> int:
+        """Return bias to counter the exchange position described by position_info.
 
         Bias scale:
             0  = no position, balanced grid
@@ -246,41 +474,27 @@ class StrategyAgent:
         Long position → positive bias → more sells
         Short position → negative bias → more buys
         """
-        position_info = self._get_position_info(pair)
         if not position_info:
             return 0
 
-        side = position_info["side"]
         notional = position_info["notional"]
-        grid_notional = GRID_PARAMS[pair]["order_size_usdt"] * settings.LEVERAGE
+        grid_notional = GRID_PARAMS[pair].order_size_usdt * settings.LEVERAGE
         position_ratio = notional / grid_notional if grid_notional > 0 else 0
 
-        if side == "long":
-            if position_ratio >= 3:
-                return 3   # Close-only: 0 buys, 6 sells
-            elif position_ratio >= 2:
-                return 2   # Close-only: 0 buys, 6 sells
-            elif position_ratio >= 1:
-                return 1   # Slight bias: 2 buys, 4 sells
-        elif side == "short":
-            if position_ratio >= 3:
-                return -3  # Close-only: 6 buys, 0 sells
-            elif position_ratio >= 2:
-                return -2  # Close-only: 6 buys, 0 sells
-            elif position_ratio >= 1:
-                return -1  # Slight bias: 4 buys, 2 sells
-        return 0
-
-    def _dca_signals(self, market_state: MarketState) -> List[OrderSignal]:
+        # Whole multiples of the grid notional, capped at 3, signed by direction (FLAT → 0):
+        # <1x → 0, 1-2x → ±1 (slight bias), 2-3x → ±2, ≥3x → ±3 (close-only)
+        return position_info["side"] * min(3, int(position_ratio))
+
+    def _dca_signals(self, market_state: MarketState, now: datetime) -> List[OrderSignal]:
         """Generate DCA buy signals for a crash/dip market."""
         pair = market_state.pair
         price = market_state.current_price
-        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
 
-        entry_pct = DCA_PARAMS["entry_pct"]
-        additional_drop_pct = DCA_PARAMS["additional_drop_pct"]
-        max_entries = DCA_PARAMS["max_entries_per_dip"]
-        take_profit_pct = DCA_PARAMS["take_profit_pct"]
+        entry_pct = DCA_PARAMS.entry_pct
+        additional_drop_pct = DCA_PARAMS.additional_drop_pct
+        max_entries = DCA_PARAMS.max_entries_per_dip
+        take_profit_pct = DCA_PARAMS.take_profit_pct
 
         dca = self._get_active_dca(pair)
 
@@ -289,10 +503,10 @@ class StrategyAgent:
             buy_usdt = settings.DCA_RESERVE * entry_pct
             amount = self._round_amount(pair, max(buy_usdt * settings.LEVERAGE / price, 0.001))
 
-            self._create_dca(pair, price, amount, buy_usdt)
-            logger.info(f"{pair} DCA: new position, entry #1 at {price:.2f} (${buy_usdt:.2f})")
+            self._create_dca(pair, price, amount, buy_usdt, now_iso)
+            logger.info("%s DCA: new position, entry #1 at %.2f ($%.2f)", pair, price, buy_usdt)
 
-            return [OrderSignal(
+            return [_order_signal(
                 pair=pair, side=OrderSide.BUY, price=price,
                 amount=amount, signal_type=SignalType.DCA_BUY, timestamp=now,
             )]
@@ -311,17 +525,15 @@ class StrategyAgent:
                 buy_usdt = settings.DCA_RESERVE * entry_pct
                 amount = self._round_amount(pair, max(buy_usdt * settings.LEVERAGE / price, 0.001))
 
-                new_total_qty = total_qty + amount
-                new_total_cost = dca["total_cost"] + buy_usdt
-                new_avg = new_total_cost / new_total_qty
+                new_total_qty, new_total_cost, new_avg = _dca_add_entry(total_qty, dca["total_cost"], amount, buy_usdt)
 
-                self._update_dca(dca["id"], entries + 1, new_total_qty, new_total_cost, new_avg, price)
+                self._update_dca(dca["id"], entries + 1, new_total_qty, new_total_cost, new_avg, price, now_iso)
                 logger.info(
-                    f"{pair} DCA: entry #{entries + 1} at {price:.2f} "
-                    f"(drop {drop_from_last*100:.1f}% from last), new avg: {new_avg:.2f}"
+                    "%s DCA: entry #%d at %.2f (drop %.1f%% from last), new avg: %.2f",
+                    pair, entries + 1, price, drop_from_last * 100, new_avg,
                 )
 
-                signals.append(OrderSignal(
+                signals.append(_order_signal(
                     pair=pair, side=OrderSide.BUY, price=price,
                     amount=amount, signal_type=SignalType.DCA_BUY, timestamp=now,
                 ))
@@ -330,8 +542,8 @@ class StrategyAgent:
                 total_qty = new_total_qty
             else:
                 logger.info(
-                    f"{pair} DCA: waiting for deeper dip "
-                    f"(need {additional_drop_pct*100:.0f}% drop, currently {drop_from_last*100:.1f}%)"
+                    "%s DCA: waiting for deeper dip (need %.0f%% drop, currently %.1f%%)",
+                    pair, additional_drop_pct * 100, drop_from_last * 100,
                 )
 
         # Check if price already recovered past TP (bounce during crash)
@@ -339,23 +551,22 @@ class StrategyAgent:
         if price >= tp_price:
             # Check actual position — don't SELL if position is SHORT (would add to short)
             position_info = self._get_position_info(pair)
-            if position_info and position_info["side"] == "short":
-                self._close_dca(dca["id"])
-                logger.info(f"{pair} DCA: closing tracking — position is SHORT, TP SELL would add to short")
+            if position_info and position_info["side"] == PositionSide.SHORT:
+                self._close_dca(dca["id"], now_iso)
+                logger.info("%s DCA: closing tracking — position is SHORT, TP SELL would add to short", pair)
                 return signals  # Return any BUY entries only
 
-            self._close_dca(dca["id"])
-            logger.info(f"{pair} DCA: price {price:.2f} >= TP {tp_price:.2f}, taking profit")
-            signals.append(OrderSignal(
-                pair=pair, side=OrderSide.SELL, price=tp_price,
-                amount=self._round_amount(pair, total_qty), signal_type=SignalType.DCA_TAKE_PROFIT, timestamp=now,
-            ))
+            self._close_dca(dca["id"], now_iso)
+            logger.info("%s DCA: price %.2f >= TP %.2f, taking profit", pair, price, tp_price)
+            signals.append(self._dca_take_profit_signal(pair, tp_price, total_qty, now))
         else:
-            logger.info(f"{pair} DCA: TP at {tp_price:.2f} (current {price:.2f}, need +{((tp_price/price)-1)*100:.2f}%)")
+            logger.info("%s DCA: TP at %.2f (current %.2f, need +%.2f%%)", pair, tp_price, price, ((tp_price / price) - 1) * 100)
 
         return signals
 
-    def _dca_take_profit_if_recovered(self, market_state: MarketState) -> List[OrderSignal]:
+    def _dca_take_profit_if_recovered(
+        self, market_state: MarketState, position_info: Optional[dict], now: datetime,
+    ) -> List[OrderSignal]:
         """If there's an active DCA and price has recovered, place a take-profit sell.
 
         Position-aware: if actual position is SHORT, don't SELL (that would add to short).
@@ -368,91 +579,101 @@ class StrategyAgent:
         if dca is None:
             return []
 
-        # Check actual position — if SHORT, DCA SELL would add to short
-        position_info = self._get_position_info(pair)
-        if position_info and position_info["side"] == "short":
-            self._close_dca(dca["id"])
-            logger.info(f"{pair} DCA: closing tracking — position is SHORT, TP SELL would add to short")
-            return []
-
-        # No position means DCA buy fully closed the short — close DCA tracking
-        if position_info is None:
-            self._close_dca(dca["id"])
-            logger.info(f"{pair} DCA: closing tracking — no open position (DCA buy closed it)")
+        # Check actual position — if SHORT, DCA SELL would add to short.
+        # No position means DCA buy fully closed the short. Either way, close DCA tracking.
+        if position_info is None or position_info["side"] == PositionSide.SHORT:
+            self._close_dca(dca["id"], now.isoformat())
+            reason = (
+                "no open position (DCA buy closed it)" if position_info is None
+                else "position is SHORT, TP SELL would add to short"
+            )
+            logger.info("%s DCA: closing tracking — %s", pair, reason)
             return []
 
         # Position is LONG — standard DCA TP logic
         avg_entry = dca["avg_entry_price"]
         total_qty = dca["total_qty"]
-        take_profit_pct = DCA_PARAMS["take_profit_pct"]
+        take_profit_pct = DCA_PARAMS.take_profit_pct
         tp_price = self._round_price(pair, avg_entry * (1 + take_profit_pct))
 
         if price >= tp_price:
             # Price recovered past take-profit — sell at market and close DCA
-            self._close_dca(dca["id"])
-            logger.info(f"{pair} DCA: price recovered to {price:.2f}, closing at take-profit {tp_price:.2f}")
-            return [OrderSignal(
-                pair=pair, side=OrderSide.SELL, price=tp_price,
-                amount=self._round_amount(pair, total_qty), signal_type=SignalType.DCA_TAKE_PROFIT,
-                timestamp=datetime.now(timezone.utc),
-            )]
+            self._close_dca(dca["id"], now.isoformat())
+            logger.info("%s DCA: price recovered to %.2f, closing at take-profit %.2f", pair, price, tp_price)
+            return [self._dca_take_profit_signal(pair, tp_price, total_qty, now)]
 
         # Not recovered yet — wait and check again next cycle
-        logger.info(f"{pair} DCA: waiting for TP at {tp_price:.2f} (current {price:.2f}, need +{((tp_price/price)-1)*100:.2f}%)")
+        logger.info(
+            "%s DCA: waiting for TP at %.2f (current %.2f, need +%.2f%%)",
+            pair, tp_price, price, ((tp_price / price) - 1) * 100,
+        )
         return []
 
+    def _dca_take_profit_signal(self, pair: str, tp_price: float, total_qty: float, now: datetime) -> OrderSignal:
+        """Build the DCA take-profit SELL for the full tracked quantity."""
+        return _order_signal(
+            pair=pair, side=OrderSide.SELL, price=tp_price,
+            amount=self._round_amount(pair, total_qty), signal_type=SignalType.DCA_TAKE_PROFIT, timestamp=now,
+        )
+
     # --- DCA state persistence ---
 
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Connection for dca_state reads/writes — opened on first use and kept for the agent's lifetime."""
+        if self._conn is None:
+            self._conn = get_connection()
+        return self._conn
+
     def _get_active_dca(self, pair: str) -> dict:
-        """Get the active DCA position for a pair, or None."""
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM dca_state WHERE pair = ? AND active = 1 ORDER BY id DESC LIMIT 1",
-                (pair,),
-            )
-            row = cursor.fetchone()
-            conn.close()
-            return dict(row) if row else None
-        except Exception:
-            return None
+        """Get the active DCA position for a pair, or None.
 
-    def _create_dca(self, pair: str, price: float, qty: float, cost: float) -> None:
-        """Create a new DCA position."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        now = datetime.now(timezone.utc).isoformat()
-        cursor.execute("""
-            INSERT INTO dca_state (pair, entries, total_qty, total_cost, avg_entry_price, last_entry_price, active, started_at, updated_at)
-            VALUES (?, 1, ?, ?, ?, ?, 1, ?, ?)
-        """, (pair, qty, cost, price, price, now, now))
-        conn.commit()
-        conn.close()
-
-    def _update_dca(self, dca_id: int, entries: int, total_qty: float, total_cost: float, avg_price: float, last_price: float) -> None:
-        """Update an existing DCA position with a new entry."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE dca_state SET entries = ?, total_qty = ?, total_cost = ?, avg_entry_price = ?,
-                last_entry_price = ?, updated_at = ? WHERE id = ?
-        """, (entries, total_qty, total_cost, avg_price, last_price, datetime.now(timezone.utc).isoformat(), dca_id))
-        conn.commit()
-        conn.close()
-
-    def _close_dca(self, dca_id: int) -> None:
-        """Mark a DCA position as inactive (closed)."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE dca_state SET active = 0, updated_at = ? WHERE id = ?",
-            (datetime.now(timezone.utc).isoformat(), dca_id),
+        Served from an in-memory index of all active rows, loaded with one query and dropped
+        whenever this agent writes dca_state or a new cycle starts (prefetch_cycle_state).
+        """
+        if self._active_dca is None:
+            try:
+                rows = self._db.execute(_SQL_ACTIVE_DCA).fetchall()
+            except Exception:
+                return None
+            self._active_dca = {}
+            for row in rows:
+                dca = dict(row)
+                # Rows are ordered by id — the newest active DCA per pair wins, as before
+                self._active_dca[dca.pop("pair")] = dca
+        dca = self._active_dca.get(pair)
+        return dict(dca) if dca else None
+
+    def _create_dca(self, pair: str, price: float, qty: float, cost: float, now_iso: str) -> None:
+        """Create a new DCA position (written when the pass ends, see _flush_dca_writes)."""
+        self._pending_dca_writes.append((_SQL_INSERT_DCA, (pair, qty, cost, price, price, now_iso, now_iso)))
+
+    def _update_dca(
+        self, dca_id: int, entries: int, total_qty: float, total_cost: float,
+        avg_price: float, last_price: float, now_iso: str,
+    ) -> None:
+        """Update an existing DCA position with a new entry (written when the pass ends)."""
+        self._pending_dca_writes.append(
+            (_SQL_UPDATE_DCA, (entries, total_qty, total_cost, avg_price, last_price, now_iso, dca_id))
         )
-        conn.commit()
-        conn.close()
 
-    def _close_only_signals(self, market_state: MarketState) -> List[OrderSignal]:
+    def _close_dca(self, dca_id: int, now_iso: str) -> None:
+        """Mark a DCA position as inactive (written when the pass ends)."""
+        self._pending_dca_writes.append((_SQL_CLOSE_DCA, (now_iso, dca_id)))
+
+    def _flush_dca_writes(self) -> None:
+        """Write buffered DCA state changes in one transaction, preserving their order."""
+        if not self._pending_dca_writes:
+            return
+        writes, self._pending_dca_writes = self._pending_dca_writes, []
+        self._active_dca = None  # Reload on next lookup — new rows only get their id on insert
+        with self._db as conn:
+            for sql, rows in groupby(writes, key=itemgetter(0)):
+                conn.executemany(sql, [params for _, params in rows])
+
+    def _close_only_signals(
+        self, market_state: MarketState, position_info: Optional[dict], now: datetime,
+    ) -> List[OrderSignal]:
         """Generate close-only orders when TRENDING with an open position.
 
         Places a single closing order at half base spacing from current price:
@@ -466,48 +687,46 @@ class StrategyAgent:
         price = market_state.current_price
         params = GRID_PARAMS[pair]
 
-        position_info = self._get_position_info(pair)
         if not position_info or position_info["amount"] == 0:
             return []
 
         side = position_info["side"]
         amount = position_info["amount"]
         # Half spacing for close-only: goal is to exit, not profit
-        close_spacing = params["grid_spacing_pct"] * 0.5
-        now = datetime.now(timezone.utc)
+        close_spacing = params.grid_spacing_pct * 0.5
 
-        if side == "long":
+        if side == PositionSide.LONG:
             # Close long → place SELL above current price
             close_price = self._round_price(pair, price * (1 + close_spacing))
             close_amount = self._round_amount(pair, amount)
             if close_amount <= 0:
                 return []
             logger.info(
-                f"{pair} TRENDING CLOSE-ONLY: sell {close_amount} @ ${close_price:.4f} "
-                f"(+{close_spacing*100:.1f}% from ${price:.4f}) to close long"
+                "%s TRENDING CLOSE-ONLY: sell %s @ $%.4f (+%.1f%% from $%.4f) to close long",
+                pair, close_amount, close_price, close_spacing * 100, price,
             )
-            return [OrderSignal(
+            return [_order_signal(
                 pair=pair, side=OrderSide.SELL, price=close_price,
                 amount=close_amount, signal_type=SignalType.GRID_SELL, timestamp=now,
             )]
-        elif side == "short":
+        elif side == PositionSide.SHORT:
             # Close short → place BUY below current price
             close_price = self._round_price(pair, price * (1 - close_spacing))
             close_amount = self._round_amount(pair, amount)
             if close_amount <= 0:
                 return []
             logger.info(
-                f"{pair} TRENDING CLOSE-ONLY: buy {close_amount} @ ${close_price:.4f} "
-                f"(-{close_spacing*100:.1f}% from ${price:.4f}) to close short"
+                "%s TRENDING CLOSE-ONLY: buy %s @ $%.4f (-%.1f%% from $%.4f) to close short",
+                pair, close_amount, close_price, close_spacing * 100, price,
             )
-            return [OrderSignal(
+            return [_order_signal(
                 pair=pair, side=OrderSide.BUY, price=close_price,
                 amount=close_amount, signal_type=SignalType.GRID_BUY, timestamp=now,
             )]
 
         return []
 
-    def _check_funding_rate_safety(self, pair: str, position_side: str) -> Tuple[bool, float]:
+    def _check_funding_rate_safety(self, pair: str, position_side: PositionSide) -> Tuple[bool, float]:
         """Check if current funding rate is safe for opening positions.
 
         Binance Futures charges funding every 8 hours (12 AM, 8 AM, 4 PM UTC).
@@ -520,42 +739,53 @@ class StrategyAgent:
             (is_safe, funding_rate): True if safe to trade, False if funding is heavily against position
         """
         try:
-            # Fetch current funding rate (updated every 8 hours)
-            funding_rate_info = self.exchange.fetch_funding_rate(pair)
-            funding_rate = float(funding_rate_info.get('fundingRate', 0))
+            # Current funding rate (updated every 8 hours) — cached for FUNDING_CACHE_TTL_SEC
+            cached = _funding_cache.get(pair)
+            if cached is not None and time.monotonic() < cached[0]:
+                funding_rate = cached[1]
+            else:
+                funding_rate_info = self.exchange.fetch_funding_rate(pair)
+                funding_rate = float(funding_rate_info.get('fundingRate', 0))
+                _funding_cache[pair] = (time.monotonic() + FUNDING_CACHE_TTL_SEC, funding_rate)
 
             # Funding rate thresholds (absolute value)
             EXTREME_FUNDING = 0.0005  # 0.05% per 8 hours = very expensive
             HIGH_FUNDING = 0.0003     # 0.03% per 8 hours = moderately expensive
 
+            # Neutral band — safe for either direction, nothing to log
+            if abs(funding_rate) <= HIGH_FUNDING:
+                return True, funding_rate
+
             # Check if funding is against the position direction
-            if position_side == "LONG":
+            if position_side == PositionSide.LONG:
                 # Long position: negative funding means we PAY (bad)
                 if funding_rate < -EXTREME_FUNDING:
                     logger.warning(
-                        f"{pair} FUNDING WARNING: Extreme negative funding {funding_rate*100:.4f}% "
-                        f"— LONGS PAY ${abs(funding_rate)*settings.LEVERAGE*100:.2f} per $100 every 8h — "
-                        f"SKIPPING grid orders to avoid bleeding money"
+                        "%s FUNDING WARNING: Extreme negative funding %.4f%% — LONGS PAY $%.2f per $100 "
+                        "every 8h — SKIPPING grid orders to avoid bleeding money",
+                        pair, funding_rate * 100, abs(funding_rate) * settings.LEVERAGE * 100,
                     )
                     return False, funding_rate
                 elif funding_rate < -HIGH_FUNDING:
                     logger.info(
-                        f"{pair} funding: {funding_rate*100:.4f}% (longs pay ${abs(funding_rate)*settings.LEVERAGE*100:.2f} per $100 every 8h)"
+                        "%s funding: %.4f%% (longs pay $%.2f per $100 every 8h)",
+                        pair, funding_rate * 100, abs(funding_rate) * settings.LEVERAGE * 100,
                     )
                     # Still trade, but user is aware of funding cost
                     return True, funding_rate
-            elif position_side == "SHORT":
+            elif position_side == PositionSide.SHORT:
                 # Short position: positive funding means we PAY (bad)
                 if funding_rate > EXTREME_FUNDING:
                     logger.warning(
-                        f"{pair} FUNDING WARNING: Extreme positive funding {funding_rate*100:.4f}% "
-                        f"— SHORTS PAY ${funding_rate*settings.LEVERAGE*100:.2f} per $100 every 8h — "
-                        f"SKIPPING grid orders to avoid bleeding money"
+                        "%s FUNDING WARNING: Extreme positive funding %.4f%% — SHORTS PAY $%.2f per $100 "
+                        "every 8h — SKIPPING grid orders to avoid bleeding money",
+                        pair, funding_rate * 100, funding_rate * settings.LEVERAGE * 100,
                     )
                     return False, funding_rate
                 elif funding_rate > HIGH_FUNDING:
                     logger.info(
-                        f"{pair} funding: {funding_rate*100:.4f}% (shorts pay ${funding_rate*settings.LEVERAGE*100:.2f} per $100 every 8h)"
+                        "%s funding: %.4f%% (shorts pay $%.2f per $100 every 8h)",
+                        pair, funding_rate * 100, funding_rate * settings.LEVERAGE * 100,
                     )
                     return True, funding_rate
 
@@ -563,6 +793,6 @@ class StrategyAgent:
             return True, funding_rate
 
         except Exception as e:
-            logger.warning(f"{pair} failed to fetch funding rate: {e} — proceeding without funding check")
+            logger.warning("%s failed to fetch funding rate: %s — proceeding without funding check", pair, e)
             # If we can't fetch funding, proceed cautiously (don't block trading)
             return True, 0.0
@@ -1,4 +1,26 @@
-GRID_PARAMS = {
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True, slots=True)
+class GridConfig:
+    """Per-pair grid parameters. Frozen — read once at import, attribute access on the hot path."""
+    num_grids: int
+    grid_spacing_pct: float
+    order_size_usdt: float
+    range_pct: float
+
+
+@dataclass(frozen=True, slots=True)
+class DCAConfig:
+    """DCA parameters shared by all pairs."""
+    entry_pct: float
+    additional_drop_pct: float
+    max_entries_per_dip: int
+    take_profit_pct: float
+
+
+_GRID_PARAMS_RAW = {
     "BTC/USDT:USDT": {
         "num_grids": 6,               # 3 buy + 3 sell — concentrated near price (dynamic-style)
         "grid_spacing_pct": 0.008,     # 0.8% base — $5.90/RT with adaptive ×1.5
@@ -31,10 +53,14 @@ GRID_PARAMS = {
     },
 }
 
+GRID_PARAMS: Dict[str, GridConfig] = {
+    pair: GridConfig(**params) for pair, params in _GRID_PARAMS_RAW.items()
+}
+
 # --- DCA Config ---
-DCA_PARAMS = {
+DCA_PARAMS = DCAConfig(**{
     "entry_pct": 0.05,         # Buy 5% of DCA reserve per entry
     "additional_drop_pct": 0.03,  # Buy more if price drops another 3%
     "max_entries_per_dip": 3,
     "take_profit_pct": 0.01,   # Take profit at avg entry + 1% — 2% was too greedy, missed exits
-}
+})
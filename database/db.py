@@ -1,65 +1,146 @@
+import atexit
 import sqlite3
 import os
+import threading
 
 from config import settings
 
+# Per-connection settings — SQLite resets these on every new connection.
+# NORMAL sync is safe under WAL (only a power loss can drop the last commits, never corrupt).
+SESSION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",      # 64 MB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped reads
+    "PRAGMA busy_timeout=5000",      # scheduler + main + health check share the file
+)
+
+# Whole schema in one script, applied in a single transaction by init_db()
+SCHEMA_DDL = """
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT UNIQUE NOT NULL,
+    pair TEXT NOT NULL,
+    side TEXT NOT NULL,
+    price REAL NOT NULL,
+    amount REAL NOT NULL,
+    filled REAL DEFAULT 0,
+    fee REAL DEFAULT 0,
+    status TEXT DEFAULT 'PENDING',
+    signal_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    updated_at TEXT
+);
+
+-- Open-order counts (risk manager, portfolio, health check) and the per-pair
+-- CANCELLED sweep in the scheduler all filter on status, then pair
+CREATE INDEX IF NOT EXISTS idx_trades_status_pair ON trades(status, pair);
+
+-- Health check counts trades in the last 24h
+CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
+
+CREATE TABLE IF NOT EXISTS dca_state (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pair TEXT NOT NULL,
+    entries INTEGER DEFAULT 0,
+    total_qty REAL DEFAULT 0,
+    total_cost REAL DEFAULT 0,
+    avg_entry_price REAL DEFAULT 0,
+    last_entry_price REAL DEFAULT 0,
+    active INTEGER DEFAULT 1,
+    started_at TEXT NOT NULL,
+    updated_at TEXT
+);
+
+-- StrategyAgent loads every active DCA row (WHERE active = 1 ORDER BY id) once per cycle.
+-- Replaces the old pair-led idx_dca_active, which that unfiltered-by-pair query can't use.
+DROP INDEX IF EXISTS idx_dca_active;
+CREATE INDEX IF NOT EXISTS idx_dca_active_id ON dca_state(active, id);
+
+CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    total_value_usdt REAL NOT NULL,
+    available_balance REAL NOT NULL,
+    unrealized_pnl REAL NOT NULL,
+    realized_pnl REAL NOT NULL,
+    open_orders_count INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+
+COMMIT;
+"""
+
+# One parked connection per thread, as (db_path, connection)
+_local = threading.local()
+
+
+class _ReusableConnection(sqlite3.Connection):
+    """Connection whose close() parks it for the next get_connection() on the same thread.
+
+    Callers keep the usual get_connection() ... conn.close() pattern. close() still
+    discards uncommitted work (that is what a real close does), so a caller that bails
+    out mid-transaction can't leak half a write into the next user. A connection that
+    is never closed, or is still in use when another is requested, is simply not reused.
+    """
+
+    def close(self) -> None:
+        if self.in_transaction:
+            self.rollback()
+        parked = getattr(_local, "conn", None)
+        if parked is None and self._owner == threading.get_ident():
+            _local.conn = (self._path, self)
+        elif parked is None or parked[1] is not self:
+            super().close()
+
+
+def _connect(path: str, factory=sqlite3.Connection) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, factory=factory)
+    conn.row_factory = sqlite3.Row
+    for pragma in SESSION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 
 def get_connection() -> sqlite3.Connection:
-    """Get a SQLite database connection, creating the DB file if needed."""
+    """Get a SQLite database connection, creating the DB file if needed.
+
+    Reuses this thread's parked connection when there is one, so the common
+    open/query/close sequence skips the file opens and PRAGMAs after the first call.
+    """
+    parked = getattr(_local, "conn", None)
+    if parked is not None:
+        _local.conn = None
+        path, conn = parked
+        if path == settings.DB_PATH:
+            return conn
+        sqlite3.Connection.close(conn)  # DB_PATH changed (tests) — don't hand out the old file
     os.makedirs(os.path.dirname(settings.DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(settings.DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect(settings.DB_PATH, factory=_ReusableConnection)
+    conn._path = settings.DB_PATH
+    conn._owner = threading.get_ident()
     return conn
 
 
+def close_connection() -> None:
+    """Really close this thread's parked connection, if any."""
+    parked = getattr(_local, "conn", None)
+    _local.conn = None
+    if parked is not None:
+        sqlite3.Connection.close(parked[1])
+
+
+atexit.register(close_connection)
+
+
 def init_db() -> None:
     """Create database tables if they don't exist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS trades (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            order_id TEXT UNIQUE NOT NULL,
-            pair TEXT NOT NULL,
-            side TEXT NOT NULL,
-            price REAL NOT NULL,
-            amount REAL NOT NULL,
-            filled REAL DEFAULT 0,
-            fee REAL DEFAULT 0,
-            status TEXT DEFAULT 'PENDING',
-            signal_type TEXT NOT NULL,
-            timestamp TEXT NOT NULL,
-            updated_at TEXT
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS dca_state (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            pair TEXT NOT NULL,
-            entries INTEGER DEFAULT 0,
-            total_qty REAL DEFAULT 0,
-            total_cost REAL DEFAULT 0,
-            avg_entry_price REAL DEFAULT 0,
-            last_entry_price REAL DEFAULT 0,
-            active INTEGER DEFAULT 1,
-            started_at TEXT NOT NULL,
-            updated_at TEXT
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS portfolio_snapshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            total_value_usdt REAL NOT NULL,
-            available_balance REAL NOT NULL,
-            unrealized_pnl REAL NOT NULL,
-            realized_pnl REAL NOT NULL,
-            open_orders_count INTEGER NOT NULL,
-            timestamp TEXT NOT NULL
-        )
-    """)
-
-    conn.commit()
+    # Short-lived private connection — schema setup never shares the reusable one
+    os.makedirs(os.path.dirname(settings.DB_PATH), exist_ok=True)
+    conn = _connect(settings.DB_PATH)
+    # WAL is stored in the file header, so setting it once here covers every later connection.
+    # Writers append to the log instead of rewriting a rollback journal, and readers don't block them.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA_DDL)
     conn.close()
@@ -4,13 +4,15 @@ This runs as a separate process from the main trading bot.
 Checks bot health every hour and sends alerts via Telegram.
 """
 
+from __future__ import annotations
+
 import logging
+import os
 import sys
 import time
-from datetime import datetime
-
-import ccxt
-import pytz
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
 
 from agents.health_monitor import HealthMonitor
 from agents.notifier import send_telegram
@@ -26,16 +28,31 @@ logging.basicConfig(
     ],
 )
 
+if TYPE_CHECKING:
+    import ccxt
+
 logger = logging.getLogger(__name__)
 
+HEARTBEAT_INTERVAL = timedelta(minutes=5)  # watchdog treats an older heartbeat as dead
+HEALTH_CHECK_INTERVAL = timedelta(hours=1)
+DAILY_SUMMARY_HOUR = 8  # 8:00 AM PHT
+MANILA_TZ = ZoneInfo("Asia/Manila")
+HEARTBEAT_FILE = os.path.join(os.path.dirname(__file__), "health_heartbeat.txt")
 
-def run_health_check():
-    """Run health check and send report via Telegram."""
-    try:
-        logger.info("Starting health check...")
+HEALTH_RESULTS_MAX_AGE_SEC = 30.0
+_last_health = None  # (time.monotonic() of the check, results)
+
+# Exchange client shared by every check — markets load once, HTTP session stays warm
+_exchange = None
+
+
+def get_exchange() -> ccxt.Exchange:
+    """Return the shared exchange client, creating it on first use."""
+    global _exchange
+    if _exchange is None:
+        import ccxt  # deferred: ccxt is a heavy import and only the exchange checks need it
 
-        # Initialize exchange connection
-        exchange = ccxt.binanceusdm({
+        _exchange = ccxt.binanceusdm({
             "apiKey": settings.BINANCE_API_KEY,
             "secret": settings.BINANCE_API_SECRET,
             "timeout": 30000,  # 30 second timeout prevents indefinite hangs
@@ -46,11 +63,34 @@ def run_health_check():
         })
 
         if settings.TESTNET:
-            exchange.set_sandbox_mode(True)
+            _exchange.set_sandbox_mode(True)
+    return _exchange
+
+
+def _check_health(monitor: HealthMonitor) -> dict:
+    """Run the monitor; drop the shared client if the exchange check failed so the next run rebuilds it.
+
+    Results younger than HEALTH_RESULTS_MAX_AGE_SEC are reused — the hourly check and the
+    8:00 daily summary can fire in the same loop pass, and one probe covers both.
+    """
+    global _exchange, _last_health
+    if _last_health is not None and time.monotonic() - _last_health[0] < HEALTH_RESULTS_MAX_AGE_SEC:
+        return _last_health[1]
+    results = monitor.check_health()
+    if not results["exchange_health"]["connected"]:
+        _exchange = None
+    _last_health = (time.monotonic(), results)
+    return results
+
+
+def run_health_check():
+    """Run health check and send report via Telegram."""
+    try:
+        logger.info("Starting health check...")
 
         # Run health check
-        monitor = HealthMonitor(exchange)
-        results = monitor.check_health()
+        monitor = HealthMonitor(get_exchange())
+        results = _check_health(monitor)
 
         # Format and send report
         report = monitor.format_health_report(results)
@@ -61,23 +101,24 @@ def run_health_check():
 
         if should_send:
             send_telegram(report)
-            logger.info(f"Health check complete: {results['overall_status']} (alert sent)")
+            logger.info("Health check complete: %s (alert sent)", results["overall_status"])
         else:
-            logger.info(f"Health check complete: {results['overall_status']} (no alert needed)")
+            logger.info("Health check complete: %s (no alert needed)", results["overall_status"])
 
         # Log detailed results
-        logger.info(f"Process running: {results['process_running']['running']}")
-        logger.info(f"Recent activity: {results['recent_activity']['active']}")
-        logger.info(f"Errors: {results['recent_errors']['error_count']}")
-        logger.info(f"Database: {results['database_health']['accessible']}")
-        logger.info(f"Exchange: {results['exchange_health']['connected']}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Process running: %s", results["process_running"]["running"])
+            logger.info("Recent activity: %s", results["recent_activity"]["active"])
+            logger.info("Errors: %s", results["recent_errors"]["error_count"])
+            logger.info("Database: %s", results["database_health"]["accessible"])
+            logger.info("Exchange: %s", results["exchange_health"]["connected"])
 
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         try:
             send_telegram(f"🚨 **Health Check Failed**\n\nError: {str(e)}")
         except Exception as telegram_error:
-            logger.error(f"Failed to send Telegram alert: {telegram_error}")
+            logger.error("Failed to send Telegram alert: %s", telegram_error)
 
 
 def send_daily_health_summary():
@@ -85,23 +126,9 @@ def send_daily_health_summary():
     try:
         logger.info("Sending daily health summary...")
 
-        # Initialize exchange connection
-        exchange = ccxt.binanceusdm({
-            "apiKey": settings.BINANCE_API_KEY,
-            "secret": settings.BINANCE_API_SECRET,
-            "timeout": 30000,  # 30 second timeout prevents indefinite hangs
-            "options": {
-                "defaultType": "future",
-                "recvWindow": 60000,
-            },
-        })
-
-        if settings.TESTNET:
-            exchange.set_sandbox_mode(True)
-
         # Run health check
-        monitor = HealthMonitor(exchange)
-        results = monitor.check_health()
+        monitor = HealthMonitor(get_exchange())
+        results = _check_health(monitor)
 
         # Always send daily summary
         report = monitor.format_health_report(results)
@@ -110,23 +137,38 @@ def send_daily_health_summary():
         logger.info("Daily health summary sent")
 
     except Exception as e:
-        logger.error(f"Daily health summary failed: {e}")
+        logger.error("Daily health summary failed: %s", e)
         try:
             send_telegram(f"🚨 **Daily Health Summary Failed**\n\nError: {str(e)}")
         except Exception as telegram_error:
-            logger.error(f"Failed to send Telegram alert: {telegram_error}")
+            logger.error("Failed to send Telegram alert: %s", telegram_error)
+
 
+def write_heartbeat(now: datetime = None):
+    """Write heartbeat file with current timestamp (or the caller's `now`) - watchdog checks this.
 
-def write_heartbeat():
-    """Write heartbeat file with current timestamp - watchdog checks this."""
+    Written to a temp file and renamed over the old one: truncating in place left a
+    window where a crash (or the watchdog reading mid-write) saw an empty file.
+    """
     try:
-        import os
-        heartbeat_file = os.path.join(os.path.dirname(__file__), "health_heartbeat.txt")
-        with open(heartbeat_file, "w") as f:
-            from datetime import timezone
-            f.write(datetime.now(timezone.utc).isoformat())
+        tmp_file = HEARTBEAT_FILE + ".tmp"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_DSYNC", 0), 0o644)
+        try:
+            os.write(fd, (now or datetime.now(timezone.utc)).isoformat().encode())
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, HEARTBEAT_FILE)
     except Exception as e:
-        logger.error(f"Failed to write heartbeat: {e}")
+        logger.error("Failed to write heartbeat: %s", e)
+
+
+def _next_daily_summary(now: datetime) -> datetime:
+    """Next 8:00 AM Manila wall time after `now`, as a UTC datetime."""
+    now_manila = now.astimezone(MANILA_TZ)
+    target = datetime(now_manila.year, now_manila.month, now_manila.day, DAILY_SUMMARY_HOUR, tzinfo=MANILA_TZ)
+    if target <= now_manila:
+        target += timedelta(days=1)
+    return target.astimezone(timezone.utc)
 
 
 def main():
@@ -135,53 +177,50 @@ def main():
     logger.info("Health checks will run every hour")
     logger.info("Daily summary will be sent at 8:00 AM PHT")
 
-    # Track last run times
-    from datetime import timedelta, timezone
-    import pytz
-
-    last_check_time = datetime.now(timezone.utc) - timedelta(hours=1)  # Trigger first check immediately
-    last_daily_summary_time = datetime.now(timezone.utc) - timedelta(days=1)
-    last_heartbeat_time = datetime.now(timezone.utc)
-
     # Run first health check immediately
     logger.info("Running initial health check...")
     run_health_check()
     write_heartbeat()
 
+    # Absolute deadlines — sleep straight to the earliest one instead of waking every 30s.
+    # The daily summary is pinned to 8:00 wall time, so it can no longer be missed when a
+    # 30s sleep straddled the 8:00 minute.
+    now = datetime.now(timezone.utc)
+    next_heartbeat = now + HEARTBEAT_INTERVAL
+    next_check = now + HEALTH_CHECK_INTERVAL
+    next_daily_summary = _next_daily_summary(now)
+
     logger.info("🔄 Simple scheduler running (no APScheduler - bulletproof)")
 
     # Main loop - simple and bulletproof
     try:
         while True:
+            next_deadline = min(next_heartbeat, next_check, next_daily_summary)
+            time.sleep(max(1.0, (next_deadline - datetime.now(timezone.utc)).total_seconds()))
             now = datetime.now(timezone.utc)
 
             # Write heartbeat every 5 minutes (watchdog checks this)
-            if (now - last_heartbeat_time).total_seconds() >= 300:  # 5 minutes
-                write_heartbeat()
-                last_heartbeat_time = now
+            if now >= next_heartbeat:
+                write_heartbeat(now)
+                next_heartbeat = now + HEARTBEAT_INTERVAL
 
             # Health check every hour
-            if (now - last_check_time).total_seconds() >= 3600:  # 1 hour
+            if now >= next_check:
                 logger.info("⏰ Running scheduled health check")
                 run_health_check()
-                last_check_time = now
+                next_check = now + HEALTH_CHECK_INTERVAL
                 write_heartbeat()  # Also write heartbeat after each check
 
             # Daily summary at 8:00 AM PHT
-            now_manila = datetime.now(pytz.timezone('Asia/Manila'))
-            if now_manila.hour == 8 and now_manila.minute == 0:
-                if (now - last_daily_summary_time).total_seconds() >= 3600:  # At least 1 hour since last
-                    logger.info("⏰ Sending daily health summary")
-                    send_daily_health_summary()
-                    last_daily_summary_time = now
-
-            # Sleep for 30 seconds before next check
-            time.sleep(30)
+            if now >= next_daily_summary:
+                logger.info("⏰ Sending daily health summary")
+                send_daily_health_summary()
+                next_daily_summary = _next_daily_summary(now)
 
     except KeyboardInterrupt:
         logger.info("Health check scheduler stopped")
     except Exception as e:
-        logger.error(f"Main loop error: {e}")
+        logger.error("Main loop error: %s", e)
         send_telegram(f"⚠️ Health monitor crashed: {e}")
 
 
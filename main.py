@@ -8,8 +8,13 @@ Designed to be called by n8n on a schedule: python main.py
 
 import json
 import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import ccxt
+import orjson
 
 from config import settings
 from agents.market_analyst import MarketAnalyst
@@ -25,6 +30,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MARKETS_CACHE_FILE = os.path.join(os.path.dirname(settings.DB_PATH), "markets_binanceusdm.json")
+MARKETS_CACHE_TTL_SEC = 6 * 3600  # listings/precision change rarely; a stale tick size only gets an order rejected
+
+ANALYSIS_WORKERS = 4  # one per pair — analysis is two REST calls plus a few ms of pandas
+
 
 def create_exchange() -> ccxt.Exchange:
     """Initialize Binance USDT-margined Futures connection."""
@@ -39,10 +49,38 @@ def create_exchange() -> ccxt.Exchange:
         exchange.set_sandbox_mode(True)
         logger.info("Running in FUTURES TESTNET mode")
 
-    exchange.load_markets()
+    _load_markets_cached(exchange)
     return exchange
 
 
+def _load_markets_cached(exchange: ccxt.Exchange) -> None:
+    """Load markets from the on-disk cache when fresh, else from the exchange (and refresh the cache).
+
+    Every `python main.py` run used to download the full markets list before doing anything.
+    Testnet markets differ from live, so testnet always loads fresh.
+    """
+    if not settings.TESTNET:
+        try:
+            if time.time() - os.path.getmtime(MARKETS_CACHE_FILE) < MARKETS_CACHE_TTL_SEC:
+                with open(MARKETS_CACHE_FILE) as f:
+                    cached = json.load(f)
+                exchange.set_markets(cached["markets"], cached["currencies"])
+                return
+        except (OSError, ValueError, KeyError) as e:
+            logger.info("Markets cache unavailable, loading from exchange: %s", e)
+
+    exchange.load_markets()
+    if settings.TESTNET:
+        return
+    try:
+        tmp_file = MARKETS_CACHE_FILE + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"markets": exchange.markets, "currencies": exchange.currencies}, f)
+        os.replace(tmp_file, MARKETS_CACHE_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Failed to write markets cache: %s", e)
+
+
 def run() -> dict:
     """Run one cycle of the trading bot pipeline."""
     init_db()
@@ -57,10 +95,15 @@ def run() -> dict:
 
     results = {}
 
+    # 1. Analyze every pair up front, concurrently — it's read-only market data, so
+    # waiting on N OHLCV/ticker round trips one after another bought nothing.
+    # Steps 2-6 stay sequential: the risk manager reads open orders written by the previous pair.
+    with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as pool:
+        analyses = {pair: pool.submit(analyst.analyze, pair) for pair in settings.PAIRS}
+
     for pair in settings.PAIRS:
         try:
-            # 1. Analyze market
-            market_state = analyst.analyze(pair)
+            market_state = analyses[pair].result()
 
             # 2. Generate signals
             signals = strategy.generate_signals(market_state)
@@ -78,19 +121,19 @@ def run() -> dict:
             snapshot = portfolio.get_snapshot()
 
             results[pair] = {
-                "market_state": json.loads(market_state.model_dump_json()),
+                "market_state": market_state.model_dump(mode="json"),
                 "signals_generated": len(signals),
                 "signals_approved": len(approved),
                 "orders_executed": len(trades),
-                "portfolio": json.loads(snapshot.model_dump_json()),
+                "portfolio": snapshot.model_dump(mode="json"),
             }
             logger.info(
-                f"{pair} | regime: {market_state.regime.value} | "
-                f"signals: {len(signals)} → approved: {len(approved)} → executed: {len(trades)}"
+                "%s | regime: %s | signals: %d → approved: %d → executed: %d",
+                pair, market_state.regime.value, len(signals), len(approved), len(trades),
             )
 
         except Exception as e:
-            logger.error(f"Error processing {pair}: {e}")
+            logger.error("Error processing %s: %s", pair, e)
             results[pair] = {"error": str(e)}
 
     return results
@@ -98,7 +141,8 @@ def run() -> dict:
 
 def main():
     results = run()
-    print(json.dumps(results, indent=2, default=str))
+    sys.stdout.buffer.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2) + b"\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
-from enum import Enum
+from enum import Enum, IntEnum
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
+class _FrozenModel(BaseModel):
+    """Shared config for the pipeline schemas — immutable once built, unknown fields rejected."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
 class MarketRegime(str, Enum):
     RANGING = "RANGING"
     TRENDING_UP = "TRENDING_UP"
@@ -11,7 +16,7 @@ class MarketRegime(str, Enum):
     CRASH = "CRASH"
 
 
-class Indicators(BaseModel):
+class Indicators(_FrozenModel):
     rsi: float
     ema_short: float
     ema_long: float
@@ -23,7 +28,7 @@ class Indicators(BaseModel):
     volume_ratio: float = 1.0  # fast(5) / slow(20) volume MA — >1.5 = spike, <0.7 = dead
 
 
-class MarketState(BaseModel):
+class MarketState(_FrozenModel):
     pair: str
     current_price: float
     volume_24h: float
@@ -45,7 +50,22 @@ class OrderSide(str, Enum):
     SELL = "SELL"
 
 
-class OrderSignal(BaseModel):
+class PositionSide(IntEnum):
+    """Exchange position direction — sign matches exposure (long +, short −)."""
+    SHORT = -1
+    FLAT = 0
+    LONG = 1
+
+    @classmethod
+    def from_ccxt(cls, side: Optional[str]) -> "PositionSide":
+        """Map a ccxt position 'side' ("long"/"short") to a PositionSide (FLAT if missing/unknown)."""
+        return _CCXT_POSITION_SIDES.get((side or "").lower(), cls.FLAT)
+
+
+_CCXT_POSITION_SIDES = {"long": PositionSide.LONG, "short": PositionSide.SHORT}
+
+
+class OrderSignal(_FrozenModel):
     pair: str
     side: OrderSide
     price: float
@@ -63,7 +83,7 @@ class OrderStatus(str, Enum):
     FAILED = "FAILED"
 
 
-class TradeLog(BaseModel):
+class TradeLog(_FrozenModel):
     order_id: str
     pair: str
     side: OrderSide
@@ -77,7 +97,7 @@ class TradeLog(BaseModel):
     updated_at: Optional[datetime] = None
 
 
-class PortfolioSnapshot(BaseModel):
+class PortfolioSnapshot(_FrozenModel):
     total_value_usdt: float
     available_balance: float
     unrealized_pnl: float
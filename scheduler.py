@@ -16,12 +16,13 @@ import os
 import signal
 import socket
 import sys
+import threading
 import time
-import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 import ccxt
-import pytz
 
 from config import settings
 from agents.market_analyst import MarketAnalyst
@@ -32,10 +33,10 @@ from agents.portfolio import PortfolioTracker
 from agents.pair_analyzer import PairAnalyzer, load_active_pairs, save_active_pairs
 from agents.notifier import (
     send_telegram, format_cycle_report, format_daily_report,
-    notify_kill_switch, notify_error,
+    notify_kill_switch, notify_error, TelegramBatch,
 )
 from config.grid_config import GRID_PARAMS
-from database.db import init_db, get_connection
+from database.db import init_db
 from models.schemas import MarketRegime
 
 logging.basicConfig(
@@ -44,8 +45,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global kill switch
-kill_switch_active = False
+HEARTBEAT_FILE = os.path.join(os.path.dirname(__file__), "bot_heartbeat.txt")
+CYCLE_INTERVAL_SEC = 60
+HEARTBEAT_INTERVAL_SEC = 300  # watchdog treats a heartbeat older than 10 min as frozen
+PAIR_ANALYSIS_INTERVAL_SEC = 6 * 3600
+DAILY_REPORT_HOUR = 10  # 10:00 AM PHT
+MARKETS_RELOAD_SEC = 24 * 3600  # refresh listings/precision on the shared exchange once a day
+ANALYSIS_WORKERS = 4  # per-pair market analysis runs concurrently (two REST calls each)
+MANILA_TZ = ZoneInfo("Asia/Manila")  # daily report schedule is in PHT
+UTC = timezone.utc
+
+# Global kill switch — an Event so any thread can trip or check it atomically
+kill_switch = threading.Event()
 
 # Track last grid center price per pair — skip cancel/replace if price hasn't moved enough
 last_grid_center = {}
@@ -54,10 +65,19 @@ last_grid_center = {}
 # Track last regime per pair — detect RANGING→TRENDING flip to cancel stale grid orders
 last_regime = {}
 
+# Shared exchange instance — built once so markets are loaded once and the HTTP session is reused
+_exchange = None
+_markets_loaded_at = 0.0  # time.monotonic() of the last successful load_markets()
+# Binance market id per ccxt pair — constant until _exchange's markets are reloaded
+_algo_symbols = {}
+
 
 def _get_algo_symbol(exchange, pair: str) -> str:
     """Convert ccxt pair (BTC/USDT:USDT) to Binance symbol (BTCUSDT) for Algo API."""
-    return exchange.market(pair)["id"]
+    symbol = _algo_symbols.get(pair)
+    if symbol is None:
+        symbol = _algo_symbols[pair] = exchange.market(pair)["id"]
+    return symbol
 
 
 def _fetch_algo_stops(exchange, pair: str) -> list:
@@ -77,6 +97,26 @@ def _fetch_algo_stops(exchange, pair: str) -> list:
         return []
 
 
+def _fetch_all_algo_stops(exchange):
+    """Fetch open algo stop orders for ALL symbols in one call, grouped by Binance symbol.
+
+    One round trip per cycle instead of one per pair. Returns None if the call fails
+    so the caller falls back to per-pair _fetch_algo_stops — never treat a failed
+    fetch as "no stops" for every pair at once.
+    """
+    try:
+        result = exchange.fapiPrivateGetOpenAlgoOrders({})
+        orders = result if isinstance(result, list) else result.get("orders", [])
+    except Exception as e:
+        logger.warning(f"Failed to fetch algo stops for all pairs, falling back to per-pair: {e}")
+        return None
+    stops_by_symbol = {}
+    for o in orders:
+        if o.get("orderType") in ("STOP_MARKET", "STOP"):
+            stops_by_symbol.setdefault(o.get("symbol"), []).append(o)
+    return stops_by_symbol
+
+
 def _cancel_algo_order(exchange, algo_id: str, pair: str) -> bool:
     """Cancel a single algo order by algoId."""
     try:
@@ -99,6 +139,12 @@ def manage_emergency_stops(exchange, positions_pnl, active_pairs):
     Uses reduceOnly to ensure stops can only close positions (never open new ones).
     """
     stop_pct = settings.EMERGENCY_STOP_PCT
+    all_stops = _fetch_all_algo_stops(exchange)
+
+    def stops_for(pair):
+        if all_stops is None:
+            return _fetch_algo_stops(exchange, pair)
+        return all_stops.get(_get_algo_symbol(exchange, pair), [])
 
     for pair in active_pairs:
         try:
@@ -121,7 +167,7 @@ def manage_emergency_stops(exchange, positions_pnl, active_pairs):
                 amount = float(exchange.amount_to_precision(pair, amount))
 
                 # Check existing algo stops via Algo Order API
-                existing_stops = _fetch_algo_stops(exchange, pair)
+                existing_stops = stops_for(pair)
 
                 # Check if existing stop is close enough to target (within 0.5%)
                 has_valid_stop = False
@@ -163,14 +209,14 @@ def manage_emergency_stops(exchange, positions_pnl, active_pairs):
 
             else:
                 # No position — cancel any orphaned algo stop orders
-                orphaned = _fetch_algo_stops(exchange, pair)
+                orphaned = stops_for(pair)
                 for stop in orphaned:
                     _cancel_algo_order(exchange, stop["algoId"], pair)
                     logger.info(f"Cancelled orphaned algo stop {stop['algoId']} for {pair}")
 
         except Exception as e:
             logger.error(f"Emergency stop management failed for {pair}: {e}")
-            send_telegram(f"⚠️ Emergency stop FAILED for {pair}: {e}")
+            send_telegram(f"⚠️ Emergency stop FAILED for {pair}: {e}", urgent=True)  # Position may be unprotected
 
 
 def create_exchange() -> ccxt.Exchange:
@@ -194,23 +240,57 @@ def create_exchange() -> ccxt.Exchange:
     return exchange
 
 
+def get_exchange() -> ccxt.Exchange:
+    """Return the process-wide exchange, creating it on first use.
+
+    create_exchange() calls load_markets() — one large REST download plus a new
+    TLS session. Doing that every 1-minute cycle was pure overhead. Markets are
+    reloaded in place every MARKETS_RELOAD_SEC so new listings and precision
+    changes are picked up; a failed reload keeps the current markets.
+    """
+    global _exchange, _markets_loaded_at
+    if _exchange is None:
+        _exchange = create_exchange()
+        _markets_loaded_at = time.monotonic()
+        _algo_symbols.clear()  # Fresh load_markets() — drop ids cached from the old markets
+    elif time.monotonic() - _markets_loaded_at >= MARKETS_RELOAD_SEC:
+        try:
+            _exchange.load_markets(reload=True)
+            _algo_symbols.clear()
+            logger.info("Reloaded exchange markets")
+        except Exception as e:
+            logger.warning(f"Market reload failed, keeping current markets: {e}")
+        _markets_loaded_at = time.monotonic()  # Retry on the next interval, not every cycle
+    return _exchange
+
+
 def run_trading_cycle():
     """Run one full trading cycle — called every 5 minutes."""
-    global kill_switch_active
-
-    if kill_switch_active:
+    if kill_switch.is_set():
         logger.warning("Kill switch active — skipping cycle")
         return
 
+    # Alerts raised during the cycle go out together with the cycle report, in one message
+    with TelegramBatch():
+        _run_trading_cycle()
+
+
+def _run_trading_cycle():
     try:
-        exchange = create_exchange()
+        exchange = get_exchange()
 
         # Load active pairs from runtime state (can be updated by auto-rotation)
         active_pairs = load_active_pairs(default_pairs=settings.PAIRS)
 
-        # Fetch account balance from exchange FIRST (needed for risk manager)
+        # Balance and positions are independent round-trips — fetch them side by side.
+        # Errors surface from .result() inside the same try blocks as before.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            balance_future = pool.submit(exchange.fetch_balance)
+            positions_future = pool.submit(exchange.fetch_positions, active_pairs)
+
+        # Account balance is needed FIRST (for risk manager)
         try:
-            balance = exchange.fetch_balance()
+            balance = balance_future.result()
             info = balance.get("info", {})
             wallet_balance = float(info.get("totalWalletBalance", 0) or 0)
             usdt_balance = {
@@ -222,7 +302,7 @@ def run_trading_cycle():
             }
         except Exception as e:
             logger.error(f"Failed to fetch balance: {e}")
-            send_telegram(f"⚠️ Balance fetch FAILED: {e}")
+            send_telegram(f"⚠️ Balance fetch FAILED: {e}", urgent=True)  # Risk checks now run on fallback capital
             wallet_balance = settings.TOTAL_CAPITAL  # Fallback to starting capital
             usdt_balance = {"free": 0, "used": 0, "total": 0, "wallet_balance": 0, "realized_pnl": 0}
 
@@ -238,7 +318,7 @@ def run_trading_cycle():
         # Fetch unrealized P&L from open positions + stop-loss check
         positions_pnl = {}
         try:
-            positions = exchange.fetch_positions(active_pairs)
+            positions = positions_future.result()
             for pos in positions:
                 amt = float(pos.get("contracts", 0) or 0)
                 if amt > 0:
@@ -266,20 +346,29 @@ def run_trading_cycle():
                             f"Position: {pair_key} {side} {amt} | entry={entry_price:.4f} mark={mark_price:.4f} | "
                             f"UPnL={unrealized_pnl:.2f} | {'profit' if unrealized_pnl >= 0 else 'loss'}={max(loss_pct, profit_pct)*100:.2f}%"
                         )
+
+            # Hand the same snapshot to strategy (+ one batched funding fetch) instead of per-pair calls
+            strategy.prefetch_cycle_state(active_pairs, positions)
         except Exception as e:
             logger.error(f"Failed to fetch positions: {e}")
-            send_telegram(f"⚠️ Position check FAILED: {e}")
+            send_telegram(f"⚠️ Position check FAILED: {e}", urgent=True)  # No P&L/stop-loss view this cycle
 
         # Manage exchange-side emergency stop losses (survive bot crashes)
         try:
             manage_emergency_stops(exchange, positions_pnl, active_pairs)
         except Exception as e:
             logger.error(f"Emergency stop management error: {e}")
-            send_telegram(f"⚠️ Emergency stop management FAILED: {e}")
+            send_telegram(f"⚠️ Emergency stop management FAILED: {e}", urgent=True)  # Positions may be unprotected
+
+        # Analyze every pair concurrently — read-only market data, so N round trips overlap.
+        # Everything after analysis stays sequential: the risk manager counts open orders
+        # and exposure from the trades rows the previous pair just wrote.
+        with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as pool:
+            analyses = {pair: pool.submit(analyst.analyze, pair) for pair in active_pairs}
 
         for pair in active_pairs:
             try:
-                market_state = analyst.analyze(pair)
+                market_state = analyses[pair].result()
 
                 # REGIME FLIP DETECTION: When market turns TRENDING, cancel stale
                 # grid orders immediately. Without this, grid orders placed during
@@ -309,7 +398,7 @@ def run_trading_cycle():
                 # BB measures actual range, ADX multiplier adds safety buffer for forming trends
                 bb_upper = market_state.indicators.bb_upper
                 bb_lower = market_state.indicators.bb_lower
-                num_grids = GRID_PARAMS.get(pair, {}).get("num_grids", 6)
+                num_grids = GRID_PARAMS[pair].num_grids if pair in GRID_PARAMS else 6
                 bb_width_pct = (bb_upper - bb_lower) / current_price if current_price > 0 else 0.01
                 adx = market_state.indicators.adx
                 adx_multiplier = min(1.5, max(1.0, 1.0 + (adx - 15) * 0.02)) if adx > 15 else 1.0
@@ -362,16 +451,8 @@ def run_trading_cycle():
                     if kept > 0:
                         logger.info(f"{pair} kept {kept} existing orders (near-fill preservation)")
 
-                # Mark DB orders as cancelled + record newly placed ones
-                conn = get_connection()
-                conn.execute(
-                    "UPDATE trades SET status = 'CANCELLED' WHERE status IN ('PENDING', 'OPEN') AND pair = ?",
-                    (pair,),
-                )
-                conn.commit()
-                conn.close()
-
-                portfolio.record_trades(trades)
+                # Mark DB orders as cancelled + record newly placed ones (single transaction)
+                portfolio.replace_open_orders(pair, trades)
                 snapshot = portfolio.get_snapshot()
 
                 # Update grid center price — only if orders were placed or kept
@@ -380,7 +461,7 @@ def run_trading_cycle():
                     last_grid_center[pair] = current_price
 
                 if risk_mgr.check_kill_switch():
-                    kill_switch_active = True
+                    kill_switch.set()
 
                 pos_info = positions_pnl.get(pair, {})
 
@@ -417,11 +498,11 @@ def run_trading_cycle():
         # Send Telegram report every cycle
         send_telegram(format_cycle_report(results, usdt_balance))
 
-        if kill_switch_active:
+        if kill_switch.is_set():
             notify_kill_switch(0)
 
     except Exception as e:
-        logger.error(f"Cycle error: {traceback.format_exc()}")
+        logger.exception("Cycle error")
         notify_error("SYSTEM", str(e))
 
 
@@ -456,7 +537,7 @@ def analyze_and_update_pairs():
     """Analyze market and AUTO-ROTATE trading pairs if better opportunities found."""
     try:
         logger.info("Running periodic pair analysis with auto-rotation...")
-        exchange = create_exchange()
+        exchange = get_exchange()
         analyzer = PairAnalyzer(exchange)
 
         # Load current active pairs from runtime state
@@ -508,15 +589,30 @@ def analyze_and_update_pairs():
 
 
 def write_heartbeat():
-    """Write heartbeat file with current timestamp - watchdog checks this."""
+    """Write heartbeat file with current timestamp - watchdog checks this.
+
+    Written to a temp file and renamed over the old one so a reader never sees a
+    truncated file. No fsync: this runs after every pair, and the watchdog only
+    looks at the file's mtime.
+    """
     try:
-        heartbeat_file = os.path.join(os.path.dirname(__file__), "bot_heartbeat.txt")
-        with open(heartbeat_file, "w") as f:
-            f.write(datetime.now(timezone.utc).isoformat())
+        tmp_file = HEARTBEAT_FILE + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.write(datetime.now(UTC).isoformat())
+        os.replace(tmp_file, HEARTBEAT_FILE)
     except Exception as e:
         logger.error(f"Failed to write heartbeat: {e}")
 
 
+def _next_daily_report(now: datetime) -> datetime:
+    """Next DAILY_REPORT_HOUR:00 Manila wall time after `now`, as a UTC datetime."""
+    now_manila = now.astimezone(MANILA_TZ)
+    target = datetime(now_manila.year, now_manila.month, now_manila.day, DAILY_REPORT_HOUR, tzinfo=MANILA_TZ)
+    if target <= now_manila:
+        target += timedelta(days=1)
+    return target.astimezone(UTC)
+
+
 def main():
     init_db()
 
@@ -529,24 +625,17 @@ def main():
 
     send_telegram(f"🤖 **Trading bot started**\n\nTestnet: {settings.TESTNET}\nActive pairs: {', '.join([p.split('/')[0] for p in active_pairs])}")
 
-    # Track last run times
-    last_cycle_time = datetime.now(timezone.utc)
-    last_daily_report_time = datetime.now(timezone.utc) - timedelta(days=1)
-    last_pair_analysis_time = datetime.now(timezone.utc) - timedelta(hours=6)
-    last_heartbeat_time = datetime.now(timezone.utc)
-
     # Run one cycle immediately
     run_trading_cycle()
     write_heartbeat()
 
-    # Graceful shutdown on Ctrl+C
-    shutdown_flag = False
+    # Graceful shutdown on Ctrl+C — an Event so the sleep below wakes immediately.
+    # The handler only sets the event: it runs on the main thread between bytecodes,
+    # possibly while that thread holds the Telegram connection lock mid-send.
+    shutdown_event = threading.Event()
 
     def shutdown(signum, frame):
-        nonlocal shutdown_flag
-        logger.info("Shutting down...")
-        send_telegram("🛑 *Trading bot stopped*")
-        shutdown_flag = True
+        shutdown_event.set()
 
     signal.signal(signal.SIGINT, shutdown)
     signal.signal(signal.SIGTERM, shutdown)
@@ -554,47 +643,60 @@ def main():
 
     logger.info("🔄 Simple scheduler running (no APScheduler - bulletproof)")
 
+    # Absolute deadlines — sleep straight to the earliest one. The old 30s poll added up to
+    # 30s of jitter to the 1-min cycle, and the daily report only fired if a wakeup happened
+    # to land inside the 10:00 minute. Intervals use the monotonic clock; the daily report
+    # is a wall-clock deadline because macOS stops the monotonic clock while asleep.
+    now = time.monotonic()
+    next_cycle = now + CYCLE_INTERVAL_SEC
+    next_heartbeat = now + HEARTBEAT_INTERVAL_SEC
+    next_pair_analysis = now  # first analysis right after startup, as before
+    next_daily_report = _next_daily_report(datetime.now(UTC))
+
     # Main loop - simple and bulletproof
-    while not shutdown_flag:
+    while not shutdown_event.is_set():
         try:
-            now = datetime.now(timezone.utc)
+            now = time.monotonic()
 
             # Write heartbeat every 5 minutes (watchdog checks this)
-            if (now - last_heartbeat_time).total_seconds() >= 300:  # 5 minutes
+            if now >= next_heartbeat:
                 write_heartbeat()
-                last_heartbeat_time = now
+                next_heartbeat = now + HEARTBEAT_INTERVAL_SEC
 
             # Trading cycle every 1 minute — faster = more responsive grid (dynamic-style)
-            if (now - last_cycle_time).total_seconds() >= 60:  # 1 minute
+            if now >= next_cycle:
                 logger.info("⏰ Running scheduled trading cycle")
                 run_trading_cycle()
-                last_cycle_time = datetime.now(timezone.utc)  # Fresh timestamp AFTER cycle, not stale 'now'
+                next_cycle = time.monotonic() + CYCLE_INTERVAL_SEC  # Measured from cycle END — a cycle can take minutes
                 write_heartbeat()  # Also write heartbeat after each cycle
 
             # Daily report at 10:00 AM PHT (02:00 UTC)
-            now_manila = datetime.now(pytz.timezone('Asia/Manila'))
-            if now_manila.hour == 10 and now_manila.minute == 0:
-                if (now - last_daily_report_time).total_seconds() >= 3600:  # At least 1 hour since last
-                    logger.info("⏰ Running daily report")
-                    send_daily_report()
-                    last_daily_report_time = now
+            if datetime.now(UTC) >= next_daily_report:
+                logger.info("⏰ Running daily report")
+                send_daily_report()
+                next_daily_report = _next_daily_report(datetime.now(UTC))
 
             # Pair analysis every 6 hours
-            if (now - last_pair_analysis_time).total_seconds() >= 21600:  # 6 hours
+            if now >= next_pair_analysis:
                 logger.info("⏰ Running pair analysis")
                 analyze_and_update_pairs()
-                last_pair_analysis_time = now
+                next_pair_analysis = now + PAIR_ANALYSIS_INTERVAL_SEC
 
-            # Sleep for 30 seconds before next check
-            time.sleep(30)
+            # The cycle deadline (≤60s) bounds the wait, so after a host sleep the wall-clock
+            # report check runs again within one cycle of waking
+            until_interval = min(next_cycle, next_heartbeat, next_pair_analysis) - time.monotonic()
+            until_report = (next_daily_report - datetime.now(UTC)).total_seconds()
+            shutdown_event.wait(max(0.0, min(until_interval, until_report)))
 
         except KeyboardInterrupt:
             break
         except Exception as e:
             logger.error(f"Main loop error: {e}")
             send_telegram(f"⚠️ Main loop error: {e}")
-            time.sleep(60)  # Wait 1 minute before retrying
+            shutdown_event.wait(60)  # Wait 1 minute before retrying
 
+    logger.info("Shutting down...")
+    send_telegram("🛑 *Trading bot stopped*")
     logger.info("Bot shutdown complete")
 
 
@@ -21,15 +21,15 @@ print('\n=== GRID CONFIG (BASE SPACING) ===\n')
 for pair, config in grid_config.GRID_PARAMS.items():
     if pair in settings.PAIRS:
         print(f'{pair}:')
-        print(f'  Base Spacing: {config["grid_spacing_pct"]*100:.1f}%')
-        print(f'  Order Size: ${config["order_size_usdt"]}')
-        print(f'  Num Grids: {config["num_grids"]}')
+        print(f'  Base Spacing: {config.grid_spacing_pct*100:.1f}%')
+        print(f'  Order Size: ${config.order_size_usdt}')
+        print(f'  Num Grids: {config.num_grids}')
 
 print('\n=== ADAPTIVE SPACING (RANGING) ===')
 print('Multiplier: 1.5x when ADX < 23, 1.0x when ADX 23-25\n')
 for pair, config in grid_config.GRID_PARAMS.items():
     if pair in settings.PAIRS:
-        base = config['grid_spacing_pct'] * 100
+        base = config.grid_spacing_pct * 100
         adaptive = base * 1.5
         print(f'{pair}: {base:.1f}% → {adaptive:.1f}%')
 
@@ -46,10 +46,10 @@ print(f'Max Open Orders: {settings.MAX_OPEN_ORDERS}')
 
 print('\n=== DCA CONFIG ===\n')
 dca = grid_config.DCA_PARAMS
-print(f'Entry: {dca["entry_pct"]*100:.0f}% of DCA reserve')
-print(f'Drop Interval: {dca["additional_drop_pct"]*100:.0f}% (buy more if drops)')
-print(f'Max Entries: {dca["max_entries_per_dip"]}')
-print(f'Take Profit: {dca["take_profit_pct"]*100:.0f}% above avg entry')
+print(f'Entry: {dca.entry_pct*100:.0f}% of DCA reserve')
+print(f'Drop Interval: {dca.additional_drop_pct*100:.0f}% (buy more if drops)')
+print(f'Max Entries: {dca.max_entries_per_dip}')
+print(f'Take Profit: {dca.take_profit_pct*100:.0f}% above avg entry')
 
 print('\n=== TECHNICAL INDICATORS ===\n')
 print(f'RSI Period: {settings.RSI_PERIOD}')
@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import patch
+
+from database import db
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test_trades.db")
+    with patch("database.db.settings") as mock_settings:
+        mock_settings.DB_PATH = path
+        db.init_db()
+        yield path
+        db.close_connection()
+
+
+class TestConnectionReuse:
+    def test_closed_connection_is_reused(self, db_path):
+        conn = db.get_connection()
+        conn.close()
+        assert db.get_connection() is conn
+
+    def test_close_discards_uncommitted_writes(self, db_path):
+        conn = db.get_connection()
+        conn.execute("INSERT INTO dca_state (pair, started_at) VALUES ('BTC/USDT:USDT', 'now')")
+        conn.close()
+
+        conn = db.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM dca_state").fetchone()[0] == 0
+
+    def test_nested_use_gets_separate_connection(self, db_path):
+        outer = db.get_connection()
+        inner = db.get_connection()
+        assert inner is not outer
+        inner.close()
+        outer.close()
+
+
+class TestSchema:
+    def test_active_dca_query_uses_index(self, db_path):
+        from agents.strategy import _SQL_ACTIVE_DCA
+
+        conn = db.get_connection()
+        plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _SQL_ACTIVE_DCA))
+        conn.close()
+        assert "idx_dca_active_id" in plan
@@ -169,3 +169,36 @@ class TestCancelStaleOrders:
         cancelled = executor.cancel_stale_orders("BTC/USDT", orders, max_age_hours=24)
         assert cancelled == 0
         mock_exchange.cancel_order.assert_not_called()
+
+
+class TestCancelAllOpenOrders:
+    def test_cancels_in_batches_of_ten(self):
+        mock_exchange = MagicMock()
+        mock_exchange.has = {"cancelOrders": True}
+        mock_exchange.fetch_open_orders.return_value = [{"id": str(i)} for i in range(12)]
+        mock_exchange.cancel_orders.side_effect = lambda ids, pair: [{"id": i} for i in ids]
+        executor = ExecutionAgent(mock_exchange)
+
+        assert executor.cancel_all_open_orders("BTC/USDT") == 12
+        batches = [c.args[0] for c in mock_exchange.cancel_orders.call_args_list]
+        assert batches == [[str(i) for i in range(10)], ["10", "11"]]
+        mock_exchange.cancel_order.assert_not_called()
+
+    def test_rejected_entries_not_counted(self):
+        mock_exchange = MagicMock()
+        mock_exchange.has = {"cancelOrders": True}
+        mock_exchange.fetch_open_orders.return_value = [{"id": "a"}, {"id": "b"}]
+        mock_exchange.cancel_orders.return_value = [{"id": "a"}, {"id": None}]
+        executor = ExecutionAgent(mock_exchange)
+
+        assert executor.cancel_all_open_orders("BTC/USDT") == 1
+
+    def test_falls_back_to_single_cancels_when_batch_fails(self):
+        mock_exchange = MagicMock()
+        mock_exchange.has = {"cancelOrders": True}
+        mock_exchange.fetch_open_orders.return_value = [{"id": "a"}, {"id": "b"}]
+        mock_exchange.cancel_orders.side_effect = ccxt.NetworkError("timeout")
+        executor = ExecutionAgent(mock_exchange)
+
+        assert executor.cancel_all_open_orders("BTC/USDT") == 2
+        assert mock_exchange.cancel_order.call_count == 2
@@ -0,0 +1,70 @@
+import http.client
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agents import notifier
+from agents.notifier import TelegramBatch, send_telegram
+
+
+class TestTelegramBatch:
+    def test_batched_messages_sent_as_one(self):
+        with patch("agents.notifier._send_now", return_value=True) as send_now:
+            with TelegramBatch():
+                send_telegram("first")
+                send_telegram("second")
+                send_now.assert_not_called()
+
+        send_now.assert_called_once_with("first\n\nsecond")
+
+    def test_urgent_bypasses_batch(self):
+        with patch("agents.notifier._send_now", return_value=True) as send_now:
+            with TelegramBatch():
+                send_telegram("alert", urgent=True)
+                send_now.assert_called_once_with("alert")
+                send_telegram("report")
+
+        assert send_now.call_count == 2
+
+    def test_splits_at_message_limit(self):
+        long_message = "x" * (notifier.TELEGRAM_MAX_CHARS - 3)
+        with patch("agents.notifier._send_now", return_value=True) as send_now:
+            with TelegramBatch():
+                send_telegram(long_message)
+                send_telegram("tail")
+
+        assert [c.args[0] for c in send_now.call_args_list] == [long_message, "tail"]
+
+    def test_failed_batch_retries_individually(self):
+        with patch("agents.notifier._send_now", side_effect=[False, True, False]) as send_now:
+            with TelegramBatch() as batch:
+                send_telegram("ok")
+                send_telegram("<bad")
+                batch_ok = batch.flush()
+
+        assert batch_ok is False
+        assert [c.args[0] for c in send_now.call_args_list] == ["ok\n\n<bad", "ok", "<bad"]
+
+
+class TestPostTelegram:
+    def test_send_failure_on_reused_connection_is_retried(self):
+        stale = MagicMock()
+        stale.request.side_effect = BrokenPipeError()
+        fresh = MagicMock()
+        fresh.getresponse.return_value.read.return_value = b'{"ok": true}'
+
+        with patch("agents.notifier._conn", stale), \
+             patch("agents.notifier.http.client.HTTPSConnection", return_value=fresh):
+            assert notifier._post_telegram("/botX/sendMessage", b"") == {"ok": True}
+        fresh.request.assert_called_once()
+
+    def test_response_failure_is_not_resent(self):
+        conn = MagicMock()
+        conn.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+
+        with patch("agents.notifier._conn", conn), \
+             patch("agents.notifier.http.client.HTTPSConnection") as new_conn:
+            with pytest.raises(http.client.RemoteDisconnected):
+                notifier._post_telegram("/botX/sendMessage", b"")
+        conn.request.assert_called_once()
+        new_conn.assert_not_called()
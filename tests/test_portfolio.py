@@ -137,6 +137,25 @@ class TestRecordTrades:
         tracker.record_trades([])  # Should not raise
 
 
+class TestReplaceOpenOrders:
+    def test_cancels_pair_open_rows_and_records_new(self, db_path):
+        with patch("agents.portfolio.get_connection", return_value=get_test_connection(db_path)):
+            tracker = PortfolioTracker(db_path)
+            tracker.record_trades([
+                make_trade(order_id="old-btc", status=OrderStatus.OPEN),
+                make_trade(order_id="old-eth", pair="ETH/USDT", status=OrderStatus.OPEN),
+            ])
+
+        with patch("agents.portfolio.get_connection", return_value=get_test_connection(db_path)):
+            tracker.replace_open_orders("BTC/USDT", [make_trade(order_id="new-btc", status=OrderStatus.OPEN)])
+
+        conn = get_test_connection(db_path)
+        statuses = {r["order_id"]: r["status"] for r in conn.execute("SELECT order_id, status FROM trades")}
+        conn.close()
+
+        assert statuses == {"old-btc": "CANCELLED", "old-eth": "OPEN", "new-btc": "OPEN"}
+
+
 class TestGetSnapshot:
     def test_snapshot_on_empty_db(self, db_path):
         with patch("agents.portfolio.get_connection", side_effect=lambda: get_test_connection(db_path)):
@@ -1,17 +1,29 @@
 import pytest
+import ccxt
 import sqlite3
 import os
 import tempfile
+import time
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone
 
-from agents.strategy import StrategyAgent
+from agents import strategy as strategy_module
+from agents.strategy import StrategyAgent, _BIAS_SPLITS, grid_spacing
+from config import settings
 from models.schemas import (
     Indicators, MarketRegime, MarketState,
-    OrderSide, SignalType,
+    OrderSide, PositionSide, SignalType,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_funding_cache():
+    """Funding rates are cached at module level — keep tests independent."""
+    strategy_module._funding_cache.clear()
+    yield
+    strategy_module._funding_cache.clear()
+
+
 def make_market_state(
     pair: str = "BTC/USDT",
     price: float = 60000.0,
@@ -154,6 +166,162 @@ class TestTrendingGrid:
         assert len(sells) == 7
 
 
+class TestBiasSplits:
+    """Grid buy/sell split per effective position bias."""
+
+    @pytest.mark.parametrize("num_grids", [6, 10])
+    def test_splits_cover_all_levels(self, num_grids):
+        for bias, split in _BIAS_SPLITS.items():
+            num_buys, num_sells = split(num_grids)
+            assert num_buys + num_sells == num_grids, f"bias={bias}"
+
+    def test_close_only_splits(self):
+        assert _BIAS_SPLITS[2](6) == (0, 6)    # Heavy long — sells only
+        assert _BIAS_SPLITS[-2](6) == (6, 0)   # Heavy short — buys only
+
+    def test_slight_bias_favors_closing_side(self):
+        assert _BIAS_SPLITS[1](6) == (2, 4)
+        assert _BIAS_SPLITS[-1](6) == (4, 2)
+        assert _BIAS_SPLITS[0](6) == (3, 3)
+
+
+class TestPositionBias:
+    """Bias = whole multiples of grid notional (25 USDT × leverage), capped at 3, signed by side."""
+
+    @pytest.mark.parametrize("side,ratio,expected", [
+        (PositionSide.LONG, 0.5, 0), (PositionSide.LONG, 1.0, 1), (PositionSide.LONG, 2.5, 2),
+        (PositionSide.LONG, 7.0, 3), (PositionSide.SHORT, 1.5, -1), (PositionSide.SHORT, 3.0, -3),
+        (PositionSide.FLAT, 5.0, 0),
+    ])
+    def test_bias_from_position_ratio(self, side, ratio, expected):
+        grid_notional = 25 * settings.LEVERAGE
+        position_info = {"side": side, "amount": 1.0, "entryPrice": ratio * grid_notional,
+                         "notional": ratio * grid_notional}
+        assert create_strategy()._get_position_bias("BTC/USDT:USDT", position_info) == expected
+
+    def test_no_position_no_bias(self):
+        assert create_strategy()._get_position_bias("BTC/USDT:USDT", None) == 0
+
+
+class TestGridSpacing:
+    def test_bb_width_split_across_grids(self):
+        # BB 59000-61000 at 60000 = 3.33% wide / 6 grids × ADX 18 multiplier (1.06)
+        spacing, bb_width, adx_mult, conf_mult = grid_spacing(make_market_state(), num_grids=6)
+        assert bb_width == pytest.approx(2000 / 60000)
+        assert adx_mult == pytest.approx(1.06)
+        assert conf_mult == 1.0
+        assert spacing == pytest.approx(bb_width / 6 * 1.06)
+
+    def test_low_confidence_widens_spacing(self):
+        state = make_market_state()
+        confident, *_ = grid_spacing(state, num_grids=6)
+        uncertain, *_ = grid_spacing(state.model_copy(update={"regime_confidence": 0.25}), num_grids=6)
+        assert uncertain == pytest.approx(confident * 1.3)
+
+
+class TestPositionCache:
+    def test_position_fetched_once_per_pass(self):
+        exchange = MagicMock()
+        exchange.fetch_positions.return_value = [{"contracts": 0.01, "side": "long", "entryPrice": 60000.0}]
+        strategy = StrategyAgent(exchange)
+
+        first = strategy._get_position_info("BTC/USDT:USDT")
+        second = strategy._get_position_info("BTC/USDT:USDT")
+
+        assert first == second
+        assert first["notional"] == pytest.approx(600.0)
+        exchange.fetch_positions.assert_called_once_with(["BTC/USDT:USDT"])
+
+    def test_fetch_failure_is_not_cached(self):
+        exchange = MagicMock()
+        exchange.fetch_positions.side_effect = [Exception("timeout"), []]
+        strategy = StrategyAgent(exchange)
+
+        assert strategy._get_position_info("BTC/USDT:USDT") is None
+        assert strategy._get_position_info("BTC/USDT:USDT") is None
+        assert exchange.fetch_positions.call_count == 2
+
+
+class TestPrefetchCycleState:
+    def test_prefetched_state_replaces_per_pair_calls(self):
+        exchange = MagicMock()
+        exchange.fetch_funding_rates.return_value = {"BTC/USDT:USDT": {"fundingRate": -0.001}}
+        strategy = StrategyAgent(exchange)
+        positions = [{"symbol": "ETH/USDT:USDT", "contracts": 0.5, "side": "short", "entryPrice": 3000.0}]
+
+        strategy.prefetch_cycle_state(["BTC/USDT:USDT", "ETH/USDT:USDT"], positions)
+
+        assert strategy._get_position_info("BTC/USDT:USDT") is None
+        assert strategy._get_position_info("ETH/USDT:USDT")["side"] == PositionSide.SHORT
+        assert strategy._check_funding_rate_safety("BTC/USDT:USDT", PositionSide.LONG) == (False, -0.001)
+        exchange.fetch_positions.assert_not_called()
+        exchange.fetch_funding_rate.assert_not_called()
+
+    def test_funding_rate_cached_between_cycles(self):
+        # The scheduler builds a new agent every cycle — the cached rate must outlive it
+        exchange = MagicMock()
+        exchange.fetch_funding_rates.return_value = {"BTC/USDT:USDT": {"fundingRate": 0.0001}}
+        StrategyAgent(exchange).prefetch_cycle_state(["BTC/USDT:USDT"], positions=[])
+
+        next_cycle = StrategyAgent(exchange)
+        next_cycle.prefetch_cycle_state(["BTC/USDT:USDT"], positions=[])
+
+        assert next_cycle._check_funding_rate_safety("BTC/USDT:USDT", PositionSide.SHORT) == (True, 0.0001)
+        exchange.fetch_funding_rates.assert_called_once()
+        exchange.fetch_funding_rate.assert_not_called()
+
+    def test_funding_rate_refetched_after_ttl(self):
+        exchange = MagicMock()
+        exchange.fetch_funding_rates.return_value = {"BTC/USDT:USDT": {"fundingRate": 0.0001}}
+        StrategyAgent(exchange).prefetch_cycle_state(["BTC/USDT:USDT"], positions=[])
+
+        expired = time.monotonic() + strategy_module.FUNDING_CACHE_TTL_SEC + 1
+        with patch("agents.strategy.time.monotonic", return_value=expired):
+            StrategyAgent(exchange).prefetch_cycle_state(["BTC/USDT:USDT"], positions=[])
+
+        assert exchange.fetch_funding_rates.call_count == 2
+
+    def test_failed_prefetch_falls_back_to_live_fetch(self):
+        exchange = MagicMock()
+        exchange.fetch_positions.side_effect = [Exception("timeout"), []]
+        exchange.fetch_funding_rates.side_effect = Exception("timeout")
+        exchange.fetch_funding_rate.return_value = {"fundingRate": 0.0001}
+        strategy = StrategyAgent(exchange)
+
+        strategy.prefetch_cycle_state(["BTC/USDT:USDT"])
+
+        assert strategy._get_position_info("BTC/USDT:USDT") is None
+        assert strategy._check_funding_rate_safety("BTC/USDT:USDT", PositionSide.LONG) == (True, 0.0001)
+        exchange.fetch_funding_rate.assert_called_once_with("BTC/USDT:USDT")
+
+
+class TestTickRounding:
+    def _strategy(self):
+        exchange = MagicMock()
+        exchange.precisionMode = ccxt.TICK_SIZE
+        exchange.market.return_value = {"precision": {"price": 0.0001, "amount": 0.1}}
+        exchange.price_to_precision.return_value = "0.6124"
+        exchange.amount_to_precision.return_value = "40.0"
+        return StrategyAgent(exchange)
+
+    def test_rounds_with_cached_ticks(self):
+        strategy = self._strategy()
+
+        assert strategy._round_price("XRP/USDT:USDT", 0.612361) == 0.6124
+        assert strategy._round_amount("XRP/USDT:USDT", 40.8163) == 40.8
+        strategy.exchange.price_to_precision.assert_not_called()
+        strategy.exchange.amount_to_precision.assert_not_called()
+        strategy.exchange.market.assert_called_once()
+
+    def test_boundary_values_defer_to_exchange(self):
+        strategy = self._strategy()
+
+        assert strategy._round_price("XRP/USDT:USDT", 0.61235) == 0.6124   # Exactly half a tick
+        assert strategy._round_amount("XRP/USDT:USDT", 40.0) == 40.0       # Exact tick multiple
+        strategy.exchange.price_to_precision.assert_called_once()
+        strategy.exchange.amount_to_precision.assert_called_once()
+
+
 class TestEdgeCases:
     def test_unknown_pair_returns_empty(self):
         strategy = create_strategy()
@@ -377,3 +545,39 @@ class TestDCASignals:
         dca_signals = [s for s in signals if s.signal_type in (SignalType.DCA_BUY, SignalType.DCA_TAKE_PROFIT)]
         assert len(dca_signals) == 0
         assert len(signals) == 10  # Pure grid
+
+    def test_dca_writes_committed_together_at_end_of_pass(self):
+        """Entry + close in one pass are buffered, then committed in order when the pass ends."""
+        strategy = create_strategy()
+        now_iso = datetime.now(timezone.utc).isoformat()
+        strategy._create_dca("BTC/USDT:USDT", 50000.0, 0.05, 12.5, now_iso)
+        strategy._close_dca(1, now_iso)
+
+        conn = get_test_connection(self.db_path)
+        assert conn.execute("SELECT COUNT(*) FROM dca_state").fetchone()[0] == 0
+        strategy._flush_dca_writes()
+        row = conn.execute("SELECT * FROM dca_state WHERE id = 1").fetchone()
+        conn.close()
+
+        assert row["pair"] == "BTC/USDT:USDT"
+        assert row["active"] == 0
+        assert strategy._pending_dca_writes == []
+
+    def test_active_dca_lookups_share_one_query(self):
+        """Active DCA rows load once; the newest active row per pair wins."""
+        conn = get_test_connection(self.db_path)
+        conn.executemany(
+            "INSERT INTO dca_state (pair, entries, last_entry_price, active, started_at) VALUES (?, ?, ?, ?, ?)",
+            [("BTC/USDT:USDT", 1, 50000.0, 1, "t0"), ("BTC/USDT:USDT", 2, 48000.0, 1, "t1"),
+             ("ETH/USDT:USDT", 1, 3000.0, 0, "t0")],
+        )
+        conn.commit()
+        conn.close()
+
+        strategy = create_strategy()
+        queries = []
+        strategy._db.set_trace_callback(queries.append)
+
+        assert strategy._get_active_dca("BTC/USDT:USDT")["entries"] == 2
+        assert strategy._get_active_dca("ETH/USDT:USDT") is None
+        assert len(queries) == 1
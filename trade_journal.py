@@ -256,7 +256,7 @@ def main():
     seen_ids = load_seen_trade_ids()
     since_ms = get_last_timestamp()
 
-    logger.info(f"Tracking {len(settings.PAIRS)} pairs, polling every {POLL_INTERVAL}s")
+    logger.info(f"Tracking {settings.NUM_PAIRS} pairs, polling every {POLL_INTERVAL}s")
     logger.info(f"CSV: {CSV_FILE}")
     logger.info(f"Starting from: {datetime.fromtimestamp(since_ms / 1000, tz=timezone.utc).isoformat()}")
 